@@ -1,5 +1,14 @@
 from .base import AI
+from .cassette import AI_Record, AI_Replay
+from .executor import AIExecutor, ExecutorSaturated, get_executor
 from .factory import get_ai
 from .gpt import AI_GPT
+from .usage import TokenBudgetExceeded, UsageMeter, get_usage_meter
+from .warmup import ConnectionWarmer, get_warmer, start_warmup
 
-__all__ = ["AI", "get_ai", "AI_GPT"]
+__all__ = [
+    "AI", "get_ai", "AI_GPT", "AI_Record", "AI_Replay",
+    "AIExecutor", "ExecutorSaturated", "get_executor",
+    "TokenBudgetExceeded", "UsageMeter", "get_usage_meter",
+    "ConnectionWarmer", "get_warmer", "start_warmup",
+]
@@ -0,0 +1,141 @@
+"""Record/replay backends for deterministic offline benchmarking.
+
+Responsibilities:
+- AI_Record: wrap a live backend and append each request/response to a cassette.
+- AI_Replay: serve recorded responses from an in-memory index, optionally
+  reproducing the recorded latencies.
+
+Cassette format: NDJSON (gzip when the path ends in .gz), one interaction per
+line: {"key", "offset", "messages", "reply" | "error", "latency", "chunks"}.
+`key` hashes the full request and is all replay needs. `messages` holds only
+the messages after the last assistant turn (normally the new user turn),
+starting at index `offset` of the normalized history, so cassettes grow
+linearly with a session; recording with full_history=True stores the whole
+history with offset 0. `chunks` is [[seconds since request, text], ...] and
+concatenates to `reply`. Non-streaming backends produce a single chunk at
+`latency`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Iterator
+from logger import ChatLogger
+from .base import AI
+from .gpt import to_chat_messages
+
+
+def request_key(messages: list) -> str:
+    """Stable key for a request: hash of the normalized role/content sequence."""
+    payload = json.dumps([[m["role"], m["content"]] for m in to_chat_messages(messages)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def iter_cassette(path: Path | str) -> Iterator[dict]:
+    """Yield recorded interactions in order (e.g. to drive a benchmark)."""
+    with _open(Path(path), "r") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+class AI_Record(AI):
+    """Pass-through backend that records every interaction of `inner`.
+
+    Only the messages new since the last assistant turn are written unless
+    `full_history` is set.
+    """
+
+    def __init__(self, inner: AI, path: Path | str, full_history: bool = False, config=None) -> None:
+        super().__init__(config)
+        self.inner = inner
+        self.path = Path(path)
+        self.full_history = full_history
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        try:
+            ChatLogger().event("ai_record.init", inner=inner.__class__.__name__, path=str(self.path))
+        except Exception:
+            pass
+
+    def generate_reply(self, messages: list, context: dict | None = None) -> str:
+        chat = to_chat_messages(messages)
+        offset = 0
+        if not self.full_history:
+            offset = next((i + 1 for i in range(len(chat) - 1, -1, -1) if chat[i]["role"] == "assistant"), 0)
+        entry = {"key": request_key(messages), "offset": offset, "messages": chat[offset:]}
+        t0 = time.perf_counter()
+        try:
+            reply = self.inner.generate_reply(messages, context=context)
+        except Exception as e:
+            entry.update(error=f"{e.__class__.__name__}: {e}", latency=round(time.perf_counter() - t0, 4))
+            self._append(entry)
+            raise
+        latency = round(time.perf_counter() - t0, 4)
+        entry.update(reply=reply, latency=latency, chunks=[[latency, reply]])
+        self._append(entry)
+        return reply
+
+    def _append(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock, _open(self.path, "a") as fh:
+            fh.write(line)
+
+
+class AI_Replay(AI):
+    """Backend that answers from a cassette without network access.
+
+    Repeated identical requests are served in recorded order; once a key's
+    recordings are used up, its last one keeps being served. Unknown requests
+    raise LookupError.
+    """
+
+    def __init__(self, path: Path | str, realtime: bool = False, config=None) -> None:
+        super().__init__(config)
+        self.path = Path(path)
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._index: dict[str, deque] = {}
+        for entry in iter_cassette(self.path):
+            self._index.setdefault(entry["key"], deque()).append(entry)
+        try:
+            ChatLogger().event(
+                "ai_replay.init", path=str(self.path), keys=str(len(self._index)), realtime=str(realtime).lower()
+            )
+        except Exception:
+            pass
+
+    def generate_reply(self, messages: list, context: dict | None = None) -> str:
+        key = request_key(messages)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                raise LookupError(f"No recorded response for request {key} in {self.path}")
+            entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        if self.realtime:
+            self._replay_timing(entry)
+        if "error" in entry:
+            raise RuntimeError(entry["error"])
+        return entry.get("reply", "")
+
+    @staticmethod
+    def _replay_timing(entry: dict) -> None:
+        """Sleep through the recorded chunk offsets (or the total latency)."""
+        t0 = time.perf_counter()
+        offsets = [offset for offset, _ in entry.get("chunks") or []] or [entry.get("latency", 0.0)]
+        for offset in offsets:
+            delay = offset - (time.perf_counter() - t0)
+            if delay > 0:
+                time.sleep(delay)
@@ -0,0 +1,97 @@
+"""Shared background executor for AI calls.
+
+Responsibilities:
+- Run backend calls off the Streamlit script thread on one bounded pool per process.
+- Reject new work once running + queued calls reach the configured bound.
+- Expose saturation metrics (workers, running, queued, rejected) for the UI and logs.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from config import get_ai_executor_config
+from logger import ChatLogger
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the executor is at capacity and cannot accept more work."""
+
+
+class AIExecutor:
+    """Bounded thread pool shared by all sessions in the process.
+
+    `ThreadPoolExecutor` queues without limit, so submissions are counted here
+    and refused beyond `max_workers + max_queue` in-flight calls.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule `fn(*args, **kwargs)`; raise ExecutorSaturated when full."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                saturated = True
+            else:
+                self._in_flight += 1
+                saturated = False
+        if saturated:
+            try:
+                ChatLogger().event("ai.executor.saturated", **{k: str(v) for k, v in self.metrics().items()})
+            except Exception:
+                pass
+            raise ExecutorSaturated(
+                f"AI executor is busy ({self.max_workers} running, {self.max_queue} queued); try again shortly"
+            )
+        fut = self._pool.submit(self._run, fn, args, kwargs)
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _done(self, _fut: Future) -> None:
+        # Also fires for futures cancelled while still queued
+        with self._lock:
+            self._in_flight -= 1
+
+    def metrics(self) -> dict:
+        """Return a snapshot: workers, running, queued, rejected and saturation (0..1)."""
+        with self._lock:
+            running, in_flight, rejected = self._running, self._in_flight, self._rejected
+        return {
+            "workers": self.max_workers,
+            "running": running,
+            "queued": max(0, in_flight - running),
+            "rejected": rejected,
+            "saturation": round(in_flight / (self.max_workers + self.max_queue), 3),
+        }
+
+
+_EXECUTOR: AIExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> AIExecutor:
+    """Return the process-wide AIExecutor, creating it from config on first use."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            cfg = get_ai_executor_config()
+            _EXECUTOR = AIExecutor(max_workers=cfg["max_workers"], max_queue=cfg["max_queue"])
+        return _EXECUTOR
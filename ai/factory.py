@@ -3,21 +3,54 @@
 Responsibility:
 - Inspect configuration to select a concrete AI backend.
 - Construct and return the backend instance used by the app.
+- "record" wraps the GPT backend and writes a cassette; "replay" serves one
+  offline (see ai.cassette and AI_CASSETTE / AI_REPLAY_REALTIME).
+- With SEMANTIC_CACHE on, put the near-duplicate prompt cache in front.
+- "gateway" returns a thin client for a shared local gateway process
+  (ai.gateway), which owns the real backend and its caches; the client and
+  its connection pool are shared process-wide.
 """
 
 from .base import AI
+from .cassette import AI_Record, AI_Replay
 from .gpt import AI_GPT
-from config import get_ai_backend
+from config import get_ai_backend, get_cassette_config, get_semantic_cache_config
 from logger import ChatLogger
 
 
-def get_ai() -> AI:
-    """Return a concrete AI backend based on env (AI_BACKEND)."""
-    backend = get_ai_backend()
+def get_ai(backend: str | None = None) -> AI:
+    """Return a concrete AI backend based on env (AI_BACKEND: gpt, record, replay, gateway).
+
+    Args:
+        backend: Optional override of AI_BACKEND (used by the gateway process).
+    """
+    backend = backend or get_ai_backend()
     try:
         ChatLogger().event("ai.backend.select", backend=backend)
     except Exception:
         pass
+    if backend == "gateway":
+        # Caching, pooling and accounting happen once, inside the gateway.
+        # Imported here so `python -m ai.gateway` does not find itself pre-imported.
+        from .gateway import get_gateway_client
+
+        return get_gateway_client()
+    ai = _select_backend(backend)
+    if get_semantic_cache_config()["enabled"]:
+        # Import locally: NumPy is only needed when the cache is on
+        from .semantic_cache import AI_SemanticCache, get_semantic_cache
+
+        return AI_SemanticCache(ai, get_semantic_cache())
+    return ai
+
+
+def _select_backend(backend: str) -> AI:
     if backend == "gpt":
         return AI_GPT()
+    if backend == "record":
+        cfg = get_cassette_config()
+        return AI_Record(AI_GPT(), cfg["path"], full_history=cfg["full_history"])
+    if backend == "replay":
+        cfg = get_cassette_config()
+        return AI_Replay(cfg["path"], realtime=cfg["realtime"])
     raise ValueError(f"Unknown AI backend: {backend}")
@@ -0,0 +1,310 @@
+"""Local inference gateway shared by several app processes.
+
+Responsibilities:
+- Server: host one AI backend (and with it one pooled OpenAI client, usage
+  meter and prompt cache) for every app process on the host.
+- Client: AI_Gateway, a thin backend that forwards generate_reply calls over
+  a reused local connection.
+
+Protocol: NDJSON over a loopback TCP or Unix socket. Each request line is
+{"id", "token", "messages", "context"} (or {"id", "token", "op": "ping"}) and
+gets one response line {"id", "reply"} or {"id", "error", "type"}. `token` is
+the shared secret AI_GATEWAY_TOKEN. A connection carries any number of
+sequential requests; the server runs a thread per connection and closes it
+when left idle for AI_GATEWAY_IDLE_SECS, on a wrong token, or on the first
+line that is not a request object (so e.g. an HTTP request smuggled from a
+browser never reaches the backend).
+
+Run the server with: python -m ai.gateway
+"""
+
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import itertools
+import json
+import os
+import select
+import socket
+import socketserver
+import threading
+from typing import IO
+from config import get_gateway_config
+from logger import ChatLogger
+from .base import AI
+from .gpt import to_chat_messages
+
+
+class GatewayError(RuntimeError):
+    """An error raised by the backend inside the gateway."""
+
+
+class GatewayAuthError(PermissionError):
+    """A request carried a missing or wrong gateway token."""
+
+
+def parse_address(address: str) -> tuple[int, str | tuple[str, int]]:
+    """Map "unix:/path" or "host:port" to (socket family, address)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET6 if ":" in host else socket.AF_INET, (host.strip("[]") or "127.0.0.1", int(port))
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except OSError:
+        return False
+    return all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def _encode(obj: dict) -> bytes:
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# --- Server ---
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self) -> None:
+        # Idle cutoff: applies to reads between requests, not to backend calls
+        self.timeout = self.server.idle_timeout  # type: ignore[attr-defined]
+        super().setup()
+
+    def handle(self) -> None:
+        try:
+            self._serve_requests()
+        except socket.timeout:
+            pass  # Idle client; finish() closes the connection
+
+    def _serve_requests(self) -> None:
+        backend: AI = self.server.backend  # type: ignore[attr-defined]
+        token: str = self.server.token  # type: ignore[attr-defined]
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            request = _parse_request(line)
+            if request is None:
+                return  # Not a gateway client: hang up without reading further
+            response = {"id": request.get("id")}
+            if not hmac.compare_digest(str(request.get("token", "")).encode("utf-8"), token.encode("utf-8")):
+                response.update(error="invalid gateway token", type=GatewayAuthError.__name__)
+                self._respond(response)
+                return
+            try:
+                if request.get("op") == "ping":
+                    response["ok"] = True
+                else:
+                    response["reply"] = backend.generate_reply(request["messages"], context=request.get("context"))
+            except Exception as e:  # noqa: BLE001 - errors travel back to the caller
+                response.update(error=str(e), type=e.__class__.__name__)
+            self._respond(response)
+
+    def _respond(self, response: dict) -> None:
+        self.wfile.write(_encode(response))
+        self.wfile.flush()
+
+
+def _parse_request(line: bytes) -> dict | None:
+    """Return the request object on `line`, or None if it is not a well-formed request."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(request, dict):
+        return None
+    if request.get("op") == "ping" or ("op" not in request and isinstance(request.get("messages"), list)):
+        return request
+    return None
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+
+def serve(address: str, backend: AI, token: str, idle_timeout: float | None = None) -> socketserver.BaseServer:
+    """Bind a gateway for `backend` (call serve_forever() on the result).
+
+    TCP addresses must be loopback and every request must carry `token`: the
+    gateway spends the configured API key on behalf of its callers, and any
+    local process (or a web page posting to localhost) can connect. Connections
+    idle for `idle_timeout` seconds are closed, so clients that vanish do not
+    pin a thread each.
+    """
+    if not token:
+        raise ValueError("A gateway token is required (set AI_GATEWAY_TOKEN)")
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)  # Stale socket from a previous run
+        server = socketserver.ThreadingUnixStreamServer(target, _Handler)
+        server.daemon_threads = True
+    else:
+        if not _is_loopback(target[0]):
+            raise ValueError(f"Gateway address must be loopback, got {address}")
+        server = (_TCP6Server if family == socket.AF_INET6 else _TCPServer)(target, _Handler)
+    server.backend = backend  # type: ignore[attr-defined]
+    server.token = token  # type: ignore[attr-defined]
+    server.idle_timeout = idle_timeout  # type: ignore[attr-defined]
+    return server
+
+
+def main() -> None:
+    """Host the configured backend (AI_GATEWAY_BACKEND) on AI_GATEWAY_ADDR."""
+    from .factory import get_ai
+    from .warmup import start_warmup
+
+    cfg = get_gateway_config()
+    if cfg["backend"] == "gateway":
+        raise ValueError("AI_GATEWAY_BACKEND cannot be 'gateway'")
+    if not cfg["token"]:
+        raise ValueError("AI_GATEWAY_TOKEN must be set to run the gateway")
+    start_warmup()
+    backend = get_ai(cfg["backend"])
+    server = serve(cfg["address"], backend, cfg["token"], idle_timeout=cfg["idle"])
+    try:
+        ChatLogger().event("ai.gateway.start", address=cfg["address"], backend=backend.__class__.__name__)
+    except Exception:
+        pass
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# --- Client ---
+
+class AI_Gateway(AI):
+    """Thin backend forwarding requests to a local gateway.
+
+    Connections are kept open and reused (one per concurrent call); pooled
+    connections the gateway has since closed are dropped before use. A request
+    is retried once on a fresh connection only when it cannot have reached the
+    backend: the send failed, or a reused connection hit EOF before any reply.
+    A reset or timeout while awaiting the reply is raised, never replayed.
+    """
+
+    def __init__(self, address: str, token: str, timeout: float = 120.0, config=None) -> None:
+        super().__init__(config)
+        self.address = address
+        self.token = token
+        self.timeout = timeout
+        self._idle: list[tuple[socket.socket, IO[bytes]]] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _connect(self) -> tuple[socket.socket, IO[bytes]]:
+        family, target = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        return sock, sock.makefile("rb")
+
+    def _checkout(self) -> tuple[socket.socket, IO[bytes]] | None:
+        """Pop a pooled connection, discarding any the gateway already closed."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                sock, rfile = self._idle.pop()
+            if not _is_dropped(sock):
+                return sock, rfile
+            rfile.close()
+            sock.close()
+
+    def _call(self, payload: dict) -> dict:
+        data = _encode(payload)
+        for attempt in range(2):
+            conn = self._checkout()
+            reused = conn is not None
+            sock, rfile = conn or self._connect()
+            try:
+                sock.sendall(data)
+            except OSError as e:
+                rfile.close()
+                sock.close()
+                if reused and attempt == 0 and not isinstance(e, socket.timeout):
+                    continue
+                raise
+            try:
+                line = rfile.readline()
+            except OSError:
+                # The request may already be running in the backend: do not replay it
+                rfile.close()
+                sock.close()
+                raise
+            if not line:
+                rfile.close()
+                sock.close()
+                if reused and attempt == 0:
+                    continue  # Closed while idle, before reading this request
+                raise ConnectionResetError("gateway closed the connection")
+            with self._lock:
+                self._idle.append((sock, rfile))
+            return json.loads(line)
+        raise ConnectionError(f"Cannot reach AI gateway at {self.address}")  # pragma: no cover
+
+    def ping(self) -> bool:
+        return bool(self._call({"id": next(self._ids), "token": self.token, "op": "ping"}).get("ok"))
+
+    def generate_reply(self, messages: list, context: dict | None = None) -> str:
+        """Forward to the gateway; backend errors are re-raised as GatewayError."""
+        response = self._call(
+            {
+                "id": next(self._ids),
+                "token": self.token,
+                "messages": to_chat_messages(messages),
+                "context": context or {},
+            }
+        )
+        if "error" in response:
+            raise GatewayError(f"{response.get('type', 'Error')}: {response['error']}")
+        return response.get("reply", "")
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock, rfile in idle:
+            rfile.close()
+            sock.close()
+
+
+def _is_dropped(sock: socket.socket) -> bool:
+    """True if an idle connection is readable, i.e. the peer sent EOF or a reset."""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+_CLIENT: AI_Gateway | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_gateway_client() -> AI_Gateway:
+    """Return the process-wide AI_Gateway, so all sessions share one connection pool."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            cfg = get_gateway_config()
+            if not cfg["token"]:
+                raise ValueError("AI_GATEWAY_TOKEN must be set to use the gateway backend")
+            _CLIENT = AI_Gateway(cfg["address"], cfg["token"], timeout=cfg["timeout"])
+        return _CLIENT
+
+
+if __name__ == "__main__":
+    main()
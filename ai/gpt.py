@@ -6,6 +6,9 @@ Responsibilities:
 - Call chat.completions.create and return the assistant's content.
 - Emit lightweight events for diagnostics (init, call, call.error).
 - Retry transient failures with simple exponential backoff.
+- Record token usage per model/session and apply session token budgets.
+- Reuse the pre-warmed shared client when OPENAI_WARMUP is on, and log the
+  first turn's latency as a cold or warm event.
 """
 
 from typing import Any
@@ -13,6 +16,30 @@ import time
 from config import get_openai_config
 from logger import ChatLogger
 from .base import AI
+from .usage import get_usage_meter
+from .warmup import get_warmer
+
+# Longest wait for the warm-up to construct its client before building a cold one
+WARMUP_WAIT_SECS: float = 30.0
+
+
+def to_chat_messages(messages: list) -> list:
+    """Map app messages to OpenAI chat messages (roles normalized, empty contents dropped).
+
+    Contents are forwarded by reference; only the small role/content dicts are new.
+    """
+    chat_messages = []
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        if not content:
+            continue
+        if role == "ai":
+            role = "assistant"
+        elif role not in ("user", "system", "assistant"):
+            role = "user"
+        chat_messages.append({"role": role, "content": content})
+    return chat_messages
 
 
 class AI_GPT(AI):
@@ -20,13 +47,21 @@ class AI_GPT(AI):
 
     def __init__(self, config: Any = None) -> None:
         super().__init__(config)
-        cfg = get_openai_config()
+        warmer = get_warmer()
+        cfg = warmer.config(timeout=WARMUP_WAIT_SECS) if warmer is not None else None
+        self.warm = cfg is not None
+        if cfg is None:
+            cfg = get_openai_config()
+        self._first_turn = True
         self.api_key = cfg["api_key"]
         self.model = cfg["model"]
         self.client = cfg["client"]
         try:
             ChatLogger().event(
-                "ai_gpt.init", model=self.model, key_suffix=self.api_key[-6:] if self.api_key else ""
+                "ai_gpt.init",
+                model=self.model,
+                key_suffix=self.api_key[-6:] if self.api_key else "",
+                warm=str(self.warm).lower(),
             )
         except Exception:
             pass
@@ -39,25 +74,20 @@ class AI_GPT(AI):
         - App's internal role "ai" is translated to OpenAI's "assistant".
         - Empty/whitespace-only contents are skipped.
         - Retries up to 3 times on exceptions with backoff (0.5s, 1s).
+        - `context["session_id"]` keys usage accounting and budgets; a spent
+          budget raises TokenBudgetExceeded or trims history (TOKEN_BUDGET_MODE).
         """
         if not messages:
             return ""
 
-        chat_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if not content:
-                continue
-            if role == "ai":
-                role = "assistant"
-            elif role not in ("user", "system", "assistant"):
-                role = "user"
-            chat_messages.append({"role": role, "content": content})
-
+        chat_messages = to_chat_messages(messages)
         if not chat_messages:
             return ""
 
+        session = str((context or {}).get("session_id") or "-")
+        meter = get_usage_meter()
+        chat_messages = meter.enforce_budget(session, chat_messages)
+
         try:
             ChatLogger().event("ai_gpt.call", model=self.model, msgs=str(len(chat_messages)))
         except Exception:
@@ -65,6 +95,7 @@ class AI_GPT(AI):
 
     # Retry transient connection errors a few times with backoff
         last_err: Exception | None = None
+        t0 = time.perf_counter()
         for attempt in range(3):
             try:
                 resp = self.client.chat.completions.create(
@@ -85,5 +116,16 @@ class AI_GPT(AI):
                     time.sleep(0.5 * (2 ** attempt))
                 else:
                     raise
+        if self._first_turn:
+            self._first_turn = False
+            try:
+                ChatLogger().event(
+                    "ai_gpt.first_turn.warm" if self.warm else "ai_gpt.first_turn.cold",
+                    model=self.model,
+                    secs=f"{time.perf_counter() - t0:.3f}",
+                )
+            except Exception:
+                pass
+        meter.record(self.model, session, getattr(resp, "usage", None))
         msg = resp.choices[0].message
         return getattr(msg, "content", "") or ""
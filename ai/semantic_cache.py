@@ -0,0 +1,228 @@
+"""Near-duplicate prompt cache.
+
+Responsibilities:
+- Embed the last user turn plus a short context window with a local hashing
+  vectorizer (word unigrams/bigrams and character trigrams; no model, no network).
+- Featurize at most MAX_EMBED_CHARS per message; a longer tail is folded in
+  as a single digest feature, so huge pastes embed in bounded time.
+- Keep vectors in a fixed-size NumPy matrix searched by cosine similarity,
+  evicting the least recently used entry when full.
+- Serve cached replies above a similarity threshold in front of any AI backend,
+  reporting hit rate and lookup latency. A hit also requires the last user
+  turn's numbers and negations to match exactly, since swapping one of those
+  barely moves the vector but changes the question.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+import zlib
+import numpy as np
+from config import get_semantic_cache_config
+from logger import ChatLogger
+from .base import AI
+from .gpt import to_chat_messages
+
+_WORD = re.compile(r"\w+")
+_GUARD = re.compile(r"\d+(?:[.,]\d+)*|\b(?:not|no|never|none|nor|cannot|without)\b|n't\b")
+CONTEXT_WEIGHT: float = 0.5  # Relative weight of prior messages vs. the last user turn
+MAX_EMBED_CHARS: int = 8_000  # Per-message text featurized; the rest is only digested
+
+
+class HashingVectorizer:
+    """Stateless text -> L2-normalized float32 vector via the hashing trick.
+
+    Features are hashed with crc32 (stable across processes) into `dim`
+    buckets with a hash-derived sign, so collisions tend to cancel out.
+    """
+
+    def __init__(self, dim: int = 2048) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> list[str]:
+        words = _WORD.findall(text.lower())
+        feats = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"#{w}#"
+            feats.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return feats
+
+    def add(self, vec: np.ndarray, text: str, weight: float = 1.0) -> None:
+        """Accumulate `text`'s hashed features into `vec` in place.
+
+        Only the first MAX_EMBED_CHARS are featurized. Beyond that the tail
+        contributes one digest feature weighted like the whole head, so long
+        messages sharing a prefix but differing later stay below the threshold.
+        """
+        if len(text) <= MAX_EMBED_CHARS:
+            self._add_features(vec, text, weight)
+            return
+        head = np.zeros(self.dim, dtype=np.float32)
+        self._add_features(head, text[:MAX_EMBED_CHARS], 1.0)
+        digest = hashlib.blake2b(text[MAX_EMBED_CHARS:].encode("utf-8"), digest_size=8).hexdigest()
+        self._add_features(head, f"#tail:{digest}", float(np.linalg.norm(head)) or 1.0, split=False)
+        vec += weight * head
+
+    def _add_features(self, vec: np.ndarray, text: str, weight: float, split: bool = True) -> None:
+        for feat in self._features(text) if split else (text,):
+            h = zlib.crc32(feat.encode("utf-8"))
+            vec[h % self.dim] += weight if h & 0x80000000 else -weight
+
+    def transform(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        self.add(vec, text)
+        return _normalize(vec)
+
+
+def guard_tokens(text: str) -> tuple[str, ...]:
+    """Numbers and negations in `text` (sorted); cache hits require an exact match."""
+    return tuple(sorted(_GUARD.findall(text.lower().replace("\u2019", "'"))))
+
+
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class SemanticCache:
+    """Fixed-capacity cosine-similarity index over hashed prompt vectors (thread-safe)."""
+
+    def __init__(self, capacity: int = 1024, dim: int = 2048, threshold: float = 0.97, context: int = 2) -> None:
+        self.capacity = capacity
+        self.threshold = threshold
+        self.context = context
+        self.vectorizer = HashingVectorizer(dim)
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)  # 0 marks a free slot
+        self._replies: list[str | None] = [None] * capacity
+        self._guards: list[tuple[str, ...] | None] = [None] * capacity
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._lookup_secs = 0.0
+
+    @staticmethod
+    def _last_user(chat: list) -> int | None:
+        return next((i for i in range(len(chat) - 1, -1, -1) if chat[i]["role"] == "user"), None)
+
+    def guard(self, messages: list) -> tuple[str, ...]:
+        """Exact-match guard for the last user turn (see guard_tokens)."""
+        chat = to_chat_messages(messages)
+        last_user = self._last_user(chat)
+        return () if last_user is None else guard_tokens(chat[last_user]["content"][:MAX_EMBED_CHARS])
+
+    def embed(self, messages: list) -> np.ndarray | None:
+        """Vector for the last user turn plus up to `context` preceding messages."""
+        chat = to_chat_messages(messages)
+        last_user = self._last_user(chat)
+        if last_user is None:
+            return None
+        vec = np.zeros(self.vectorizer.dim, dtype=np.float32)
+        self.vectorizer.add(vec, chat[last_user]["content"])
+        for msg in chat[max(0, last_user - self.context):last_user]:
+            self.vectorizer.add(vec, msg["content"], CONTEXT_WEIGHT)
+        return _normalize(vec)
+
+    def lookup(self, vec: np.ndarray, guard: tuple[str, ...] = ()) -> tuple[str | None, float]:
+        """Return (cached reply or None, best similarity) and update metrics/LRU.
+
+        Only entries inserted with the same `guard` can hit.
+        """
+        t0 = time.perf_counter()
+        with self._lock:
+            reply, best = None, 0.0
+            if self._size:
+                sims = self._vectors[: self._size] @ vec
+                best = float(sims.max())
+                candidates = np.flatnonzero(sims >= self.threshold)
+                for idx in candidates[np.argsort(-sims[candidates])]:  # Best match first
+                    if self._guards[idx] == guard:
+                        self._tick += 1
+                        self._last_used[idx] = self._tick
+                        reply = self._replies[idx]
+                        break
+            if reply is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            self._lookup_secs += time.perf_counter() - t0
+        return reply, best
+
+    def insert(self, vec: np.ndarray, reply: str, guard: tuple[str, ...] = ()) -> None:
+        """Store a reply, evicting the least recently used entry when full."""
+        with self._lock:
+            if self._size < self.capacity:
+                idx = self._size
+                self._size += 1
+            else:
+                idx = int(np.argmin(self._last_used))
+            self._tick += 1
+            self._vectors[idx] = vec
+            self._replies[idx] = reply
+            self._guards[idx] = guard
+            self._last_used[idx] = self._tick
+
+    def metrics(self) -> dict:
+        """Return size, hits, misses, hit_rate and mean lookup latency (ms)."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": self._size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "lookup_ms": round(1000 * self._lookup_secs / lookups, 3) if lookups else 0.0,
+            }
+
+
+class AI_SemanticCache(AI):
+    """Backend wrapper answering near-duplicate prompts from a SemanticCache."""
+
+    def __init__(self, inner: AI, cache: SemanticCache, config=None) -> None:
+        super().__init__(config)
+        self.inner = inner
+        self.cache = cache
+
+    def generate_reply(self, messages: list, context: dict | None = None) -> str:
+        vec = self.cache.embed(messages)
+        if vec is None:
+            return self.inner.generate_reply(messages, context=context)
+        guard = self.cache.guard(messages)
+        reply, similarity = self.cache.lookup(vec, guard)
+        try:
+            ChatLogger().event(
+                "ai.cache.hit" if reply is not None else "ai.cache.miss",
+                similarity=f"{similarity:.3f}",
+                **{k: str(v) for k, v in self.cache.metrics().items()},
+            )
+        except Exception:
+            pass
+        if reply is not None:
+            return reply
+        reply = self.inner.generate_reply(messages, context=context)
+        if reply and not reply.isspace():
+            self.cache.insert(vec, reply, guard)
+        return reply
+
+
+_CACHE: SemanticCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache | None:
+    """Return the process-wide SemanticCache, or None when SEMANTIC_CACHE is off."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            cfg = get_semantic_cache_config()
+            if not cfg["enabled"]:
+                return None
+            _CACHE = SemanticCache(
+                capacity=cfg["capacity"], dim=cfg["dim"], threshold=cfg["threshold"], context=cfg["context"]
+            )
+        return _CACHE
@@ -0,0 +1,158 @@
+"""In-process token usage accounting.
+
+Responsibilities:
+- Capture prompt/completion tokens from chat completion responses (or the
+  final chunk of a stream requested with include_usage).
+- Aggregate them in locked counters keyed by model, session and UTC hour.
+- Flush aggregates every USAGE_FLUSH_SECS (background timer, and when a
+  record finds a flush overdue) as `ai.usage` events through ChatLogger.
+- Enforce optional per-session token budgets by rejecting or trimming requests.
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime as dt
+import threading
+import time
+from typing import Any
+from config import get_usage_config
+from logger import ChatLogger
+
+
+class TokenBudgetExceeded(RuntimeError):
+    """Raised when a session has used up its token budget (reject mode)."""
+
+
+def estimate_tokens(messages: list) -> int:
+    """Rough prompt size (~4 chars per token plus per-message overhead); no tokenizer needed."""
+    return sum(len(m.get("content", "")) // 4 + 4 for m in messages)
+
+
+class UsageMeter:
+    """Thread-safe token counters with periodic flushing and session budgets.
+
+    Counters flushed to the log are reset; per-session totals are kept for the
+    life of the process so budgets survive flushes.
+    """
+
+    def __init__(self, flush_secs: int = 60, session_budget: int = 0, budget_mode: str = "reject") -> None:
+        self.flush_secs = flush_secs
+        self.session_budget = session_budget
+        self.budget_mode = budget_mode
+        self._lock = threading.Lock()
+        # (model, session, hour) -> [requests, prompt_tokens, completion_tokens]
+        self._pending: dict[tuple[str, str, str], list[int]] = {}
+        self._session_totals: dict[str, int] = {}
+        self._last_flush = time.monotonic()
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Flush every `flush_secs` on a daemon thread, so idle processes still report."""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="ai-usage-flush", daemon=True)
+            self._flusher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_secs):
+            self.flush()
+
+    def record(self, model: str, session: str, usage: Any) -> None:
+        """Add one response's `usage` (object or dict); missing usage is ignored."""
+        if usage is None:
+            return
+        get = usage.get if isinstance(usage, dict) else lambda k, d=0: getattr(usage, k, d)
+        prompt = int(get("prompt_tokens", 0) or 0)
+        completion = int(get("completion_tokens", 0) or 0)
+        hour = dt.datetime.now(dt.UTC).strftime("%Y-%m-%dT%H")
+        with self._lock:
+            row = self._pending.setdefault((model, session, hour), [0, 0, 0])
+            row[0] += 1
+            row[1] += prompt
+            row[2] += completion
+            self._session_totals[session] = self._session_totals.get(session, 0) + prompt + completion
+            due = time.monotonic() - self._last_flush >= self.flush_secs
+        if due:
+            self.flush()
+
+    def session_total(self, session: str) -> int:
+        with self._lock:
+            return self._session_totals.get(session, 0)
+
+    def enforce_budget(self, session: str, messages: list) -> list:
+        """Return `messages` as allowed by the session's budget.
+
+        An exhausted budget raises TokenBudgetExceeded in either mode. In
+        "trim" mode the oldest non-system messages are dropped until the
+        estimated prompt fits the remaining budget (the last message is always
+        kept); if it still does not fit, TokenBudgetExceeded is raised.
+        """
+        if not self.session_budget:
+            return messages
+        remaining = self.session_budget - self.session_total(session)
+        if remaining <= 0:
+            raise TokenBudgetExceeded(f"Session token budget of {self.session_budget} exhausted")
+        if self.budget_mode == "reject":
+            return messages
+        trimmed = list(messages)
+        while len(trimmed) > 1 and estimate_tokens(trimmed) > remaining:
+            idx = next((i for i, m in enumerate(trimmed[:-1]) if m.get("role") != "system"), None)
+            if idx is None:
+                break
+            trimmed.pop(idx)
+        if estimate_tokens(trimmed) > remaining:
+            raise TokenBudgetExceeded(
+                f"Prompt exceeds the {remaining} tokens left in the session budget of {self.session_budget}"
+            )
+        return trimmed
+
+    def snapshot(self) -> dict:
+        """Return unflushed counters as {(model, session, hour): [requests, prompt, completion]}."""
+        with self._lock:
+            return {k: list(v) for k, v in self._pending.items()}
+
+    def flush(self) -> None:
+        """Emit one `ai.usage` event per (model, session, hour) and reset the counters."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            log = ChatLogger()
+            for (model, session, hour), (requests, prompt, completion) in pending.items():
+                log.event(
+                    "ai.usage",
+                    model=model,
+                    session=session,
+                    hour=hour,
+                    requests=str(requests),
+                    prompt_tokens=str(prompt),
+                    completion_tokens=str(completion),
+                )
+        except Exception:
+            pass
+
+
+_METER: UsageMeter | None = None
+_METER_LOCK = threading.Lock()
+
+
+def get_usage_meter() -> UsageMeter:
+    """Return the process-wide UsageMeter, creating it from config on first use."""
+    global _METER
+    with _METER_LOCK:
+        if _METER is None:
+            cfg = get_usage_config()
+            _METER = UsageMeter(
+                flush_secs=cfg["flush_secs"],
+                session_budget=cfg["session_budget"],
+                budget_mode=cfg["budget_mode"],
+            )
+            _METER.start()
+            atexit.register(_METER.flush)
+        return _METER
@@ -0,0 +1,113 @@
+"""Opt-in connection warm-up for the OpenAI backend.
+
+Responsibilities:
+- Build the OpenAI client once per process, ahead of the first session turn.
+- Open pooled connections (DNS + TLS) to OPENAI_BASE_URL with a cheap request.
+- Keep them alive with periodic cheap requests on a daemon thread.
+- Hand the warmed client to new AI_GPT instances so sessions share the pool.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from config import get_openai_config, get_warmup_config
+from logger import ChatLogger
+
+
+def _event(name: str, **fields: str) -> None:
+    try:
+        ChatLogger().event(name, **fields)
+    except Exception:
+        pass
+
+
+class ConnectionWarmer:
+    """Background client construction plus keep-alive pings.
+
+    The ping is `models.retrieve(model)`: a small GET that spends no tokens but
+    goes through the same host, pool and TLS session as chat completions.
+    """
+
+    def __init__(self, keepalive_secs: int = 60) -> None:
+        self.keepalive_secs = keepalive_secs
+        self._cfg: dict | None = None
+        self._built = threading.Event()  # Client constructed (or construction failed)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start warming in the background; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="ai-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def config(self, timeout: float | None = None) -> dict | None:
+        """Return the shared {"api_key", "model", "client"}, waiting up to `timeout` seconds.
+
+        Only client construction is awaited; the handshake ping keeps running in
+        the background. Returns None if warm-up was never started, the client
+        could not be built, or it is still being built.
+        """
+        if self._thread is None:
+            return None
+        self._built.wait(timeout)
+        return self._cfg
+
+    def _ping(self) -> None:
+        self._cfg["client"].models.retrieve(self._cfg["model"])
+
+    def _run(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._cfg = get_openai_config()
+        except Exception as e:
+            _event("ai.warmup.error", error=f"{e.__class__.__name__}: {e}")
+            return
+        finally:
+            self._built.set()
+        try:
+            self._ping()
+            _event("ai.warmup", secs=f"{time.perf_counter() - t0:.3f}")
+        except Exception as e:  # Client is still usable; only the ping failed
+            _event("ai.warmup.error", error=f"{e.__class__.__name__}: {e}")
+        while self.keepalive_secs > 0 and not self._stop.wait(self.keepalive_secs):
+            try:
+                self._ping()
+            except Exception as e:
+                _event("ai.keepalive.error", error=f"{e.__class__.__name__}: {e}")
+
+
+_WARMER: ConnectionWarmer | None = None
+_WARMER_LOCK = threading.Lock()
+
+
+def get_warmer() -> ConnectionWarmer | None:
+    """Return the process-wide warmer, or None when OPENAI_WARMUP is off."""
+    global _WARMER
+    with _WARMER_LOCK:
+        if _WARMER is None:
+            cfg = get_warmup_config()
+            if not cfg["enabled"]:
+                return None
+            _WARMER = ConnectionWarmer(keepalive_secs=cfg["keepalive_secs"])
+        return _WARMER
+
+
+def start_warmup() -> bool:
+    """Start the process-wide warm-up if enabled; return whether it is enabled."""
+    warmer = get_warmer()
+    if warmer is None:
+        return False
+    warmer.start()
+    return True
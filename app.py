@@ -3,16 +3,20 @@
 Responsibilities:
 - UI: Render a minimal chat interface and sidebar copy.
 - State: Manage session-level messages, logger, and AI instance.
-- Backend: Route messages to AI via ai.factory.get_ai().
+- Backend: Route messages to AI via ai.factory.get_ai() on the shared AI executor;
+  a polling fragment renders progress so the UI stays responsive.
 - Telemetry: Emit lightweight events around init and AI calls.
 """
 
 from __future__ import annotations
 import datetime as dt
 import html
+import time
+import uuid
 from typing import Dict, List
 import streamlit as st
-from ai import get_ai
+from ai import ExecutorSaturated, get_ai, get_executor, start_warmup
+from config import get_ai_executor_config
 from logger import ChatLogger
 
 
@@ -26,12 +30,28 @@ st.set_page_config(
 
 # --- Constants ---
 MAX_MESSAGES: int = 100  # Cap in-memory history length
+LARGE_MESSAGE_CHARS: int = 20_000  # Longer messages render as a preview until expanded
+PREVIEW_CHARS: int = 2_000  # Characters shown in a collapsed large message
+POLL_INTERVAL: float = get_ai_executor_config()["poll_interval"]  # Seconds between turn polls
+
+# --- Connection warm-up (opt-in via OPENAI_WARMUP) ---
+# Idempotent and non-blocking: the first script run in the process starts it,
+# and get_ai() below picks up the warmed client (waiting if it is mid-flight).
+start_warmup()
 
 # --- Session state init ---
 if "messages" not in st.session_state:
     st.session_state["messages"] = []
 if "logger" not in st.session_state:
     st.session_state["logger"] = ChatLogger()
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex[:12]  # Keys token usage accounting
+if "expanded" not in st.session_state:
+    st.session_state["expanded"] = set()  # Ids of large messages shown in full
+if "turn" not in st.session_state:
+    st.session_state["turn"] = None  # In-flight AI call: {"future", "started"}
+if "queued" not in st.session_state:
+    st.session_state["queued"] = []  # User messages waiting for the in-flight turn
 if "ai_instance" not in st.session_state:
     try:
         ai_impl = get_ai()
@@ -54,6 +74,22 @@ with st.sidebar:
         ),
         unsafe_allow_html=True,
     )
+    _metrics = get_executor().metrics()
+    st.metric(
+        "AI executor",
+        f"{_metrics['running']}/{_metrics['workers']} busy",
+        delta=f"{_metrics['queued']} queued" if _metrics["queued"] else None,
+        delta_color="inverse",
+        help=f"Saturation {_metrics['saturation']:.0%}, rejected {_metrics['rejected']}",
+    )
+    _cache = getattr(st.session_state["ai_instance"], "cache", None)
+    if _cache is not None:
+        _cm = _cache.metrics()
+        st.metric(
+            "Prompt cache hit rate",
+            f"{_cm['hit_rate']:.0%}",
+            help=f"{_cm['hits']} hits, {_cm['misses']} misses, {_cm['size']} entries, {_cm['lookup_ms']} ms/lookup",
+        )
 
 # --- Styles (align user right, assistant left; no avatars) ---
 # Load external CSS if present
@@ -64,69 +100,153 @@ if _css_path.exists():
 
 # --- Chat feed ---
 
-_bubbles: list[str] = []
-for msg in st.session_state["messages"]:
-    role = msg.get("role", "ai")
+def _bubble(msg: dict, cls: str, expanded: bool = False) -> str:
+    """Return bubble HTML; large messages cache their last rendering as (cls, expanded, html)."""
     content = msg.get("content", "")
-    safe = html.escape(content)
-    cls = "user" if role == "user" else "ai"
-    _bubbles.append(f'<div class="msg {cls}"><div class="content">{safe}</div></div>')
+    if len(content) <= LARGE_MESSAGE_CHARS:
+        return f'<div class="msg {cls}"><div class="content">{html.escape(content)}</div></div>'
+    cached = msg.get("_html")
+    if cached is None or cached[:2] != (cls, expanded):
+        if expanded:
+            body = html.escape(content)
+        else:
+            hidden = len(content) - PREVIEW_CHARS
+            body = html.escape(content[:PREVIEW_CHARS]) + f'<div class="truncated">… {hidden:,} more characters</div>'
+        cached = msg["_html"] = (cls, expanded, f'<div class="msg {cls}"><div class="content">{body}</div></div>')
+    return cached[2]
+
+
+def _flush_feed(bubbles: list[str]) -> None:
+    if bubbles:
+        st.markdown(f'<div class="chat-feed">{"".join(bubbles)}</div>', unsafe_allow_html=True)
+        bubbles.clear()
+
+
+def _toggle_expanded(msg_id: str) -> None:
+    st.session_state["expanded"] ^= {msg_id}
+
+
+_bubbles: list[str] = []
+_feed = [(m, "user" if m.get("role", "ai") == "user" else "ai") for m in st.session_state["messages"]]
+_feed += [(m, "user queued") for m in st.session_state["queued"]]
+for msg, cls in _feed:
+    if len(msg.get("content", "")) <= LARGE_MESSAGE_CHARS:
+        _bubbles.append(_bubble(msg, cls))
+        continue
+    # Large message: its own block plus a toggle, so the full text is only escaped and sent on demand
+    msg_id = msg.setdefault("id", uuid.uuid4().hex[:12])
+    expanded = msg_id in st.session_state["expanded"]
+    _bubbles.append(_bubble(msg, cls, expanded))
+    _flush_feed(_bubbles)
+    st.button(
+        "Collapse" if expanded else f"Show full message ({len(msg['content']):,} chars)",
+        key=f"expand_{msg_id}",
+        on_click=_toggle_expanded,
+        args=(msg_id,),
+    )
+_flush_feed(_bubbles)
+
+# --- AI turns ---
+
+def _now() -> str:
+    return dt.datetime.now(dt.UTC).isoformat(timespec="seconds")
+
+
+def _append_ai(content: str) -> None:
+    ai_msg = {"role": "ai", "content": content, "ts": _now()}
+    st.session_state["messages"].append(ai_msg)
+    st.session_state["logger"].log(ai_msg["role"], ai_msg["content"])
+    # Enforce cap (keep most recent messages)
+    if len(st.session_state["messages"]) > MAX_MESSAGES:
+        st.session_state["messages"] = st.session_state["messages"][-MAX_MESSAGES:]
 
-st.markdown(
-    f'<div class="chat-feed">{"".join(_bubbles)}</div>',
-    unsafe_allow_html=True,
-)
+
+def _start_turn() -> None:
+    """Submit the current history to the backend without blocking the script."""
+    logger = st.session_state["logger"]
+    try:
+        if st.session_state["ai_instance"] is None:
+            st.session_state["ai_instance"] = get_ai()
+        logger.event("ai.call.start", count=str(len(st.session_state["messages"])))
+        future = get_executor().submit(
+            # Snapshot the history: the session keeps mutating it while the call runs
+            st.session_state["ai_instance"].generate_reply,
+            list(st.session_state["messages"]),
+            context={"session_id": st.session_state["session_id"]},
+        )
+    except Exception as e:  # noqa: BLE001 - surface any AI error to the UI
+        if isinstance(e, ExecutorSaturated):
+            logger.event("ai.call.rejected", error=str(e))
+        _append_ai(f"[error] {e}")
+        return
+    st.session_state["turn"] = {"future": future, "started": time.monotonic()}
+
+
+def _finish_turn(content: str) -> None:
+    """Record the turn's outcome, then start the next queued message, if any.
+
+    A queued message whose turn fails to start gets its [error] reply and the
+    next one is tried, so the queue never stalls without an in-flight turn.
+    """
+    st.session_state["turn"] = None
+    _append_ai(content)
+    while st.session_state["queued"] and st.session_state["turn"] is None:
+        st.session_state["messages"].append(st.session_state["queued"].pop(0))
+        _start_turn()
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def _poll_turn() -> None:
+    """Show progress for the in-flight turn; rerun the app once it completes."""
+    turn = st.session_state["turn"]
+    if turn is None:
+        return
+    future = turn["future"]
+    logger = st.session_state["logger"]
+    elapsed = time.monotonic() - turn["started"]
+    if future.done():
+        try:
+            reply = future.result()
+        except Exception as e:  # noqa: BLE001 - surface any AI error to the UI
+            logger.event("ai.call.error", error=str(e), secs=f"{elapsed:.2f}")
+            _finish_turn(f"[error] {e}")
+        else:
+            logger.event("ai.call.end", chars=str(len(reply or "")), secs=f"{elapsed:.2f}")
+            _finish_turn(reply if (reply and not reply.isspace()) else "[empty response]")
+        st.rerun()
+    queued = len(st.session_state["queued"])
+    status = f"Thinking... {elapsed:.0f}s" + (f" ({queued} queued)" if queued else "")
+    col_status, col_cancel = st.columns([5, 1])
+    col_status.caption(status)
+    if col_cancel.button("Cancel", key="cancel_turn"):
+        # A running call cannot be interrupted; its result is simply discarded
+        future.cancel()
+        logger.event("ai.call.cancel", secs=f"{elapsed:.2f}")
+        _finish_turn("[cancelled]")
+        st.rerun()
+
+
+if st.session_state["turn"] is not None:
+    _poll_turn()
 
 # --- Input & send ---
 prompt = st.chat_input("Type a message and press Enter")
 if prompt is not None:
     text = prompt.strip()
     if text:
-        # Append user message
         user_msg = {
             "role": "user",
             "content": text,
             # Timestamp is currently unused in UI but kept for future needs
-            "ts": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+            "ts": _now(),
         }
-        st.session_state["messages"].append(user_msg)
         st.session_state["logger"].log(user_msg["role"], user_msg["content"])
-
-        # Generate AI reply
-        try:
-            if st.session_state["ai_instance"] is None:
-                st.session_state["ai_instance"] = get_ai()
-            with st.spinner("Thinking..."):
-                logger = st.session_state["logger"]
-                logger.event("ai.call.start", count=str(len(st.session_state["messages"])) )
-                reply = st.session_state["ai_instance"].generate_reply(
-                    st.session_state["messages"], context=None
-                )
-                logger.event("ai.call.end", chars=str(len(reply or "")))
-        except Exception as e:  # noqa: BLE001 - surface any AI error to the UI
-            st.error(f"Couldn't get a reply: {e}")
-            # Also append an AI message so the chat always shows something
-            ai_msg = {
-                "role": "ai",
-                "content": f"[error] {e}",
-                "ts": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
-            }
-            st.session_state["messages"].append(ai_msg)
-            st.session_state["logger"].log(ai_msg["role"], ai_msg["content"])
-            # Re-render and stop
-            st.rerun()
+        if st.session_state["turn"] is not None:
+            # A reply is still pending; answer this one next
+            st.session_state["queued"].append(user_msg)
         else:
-            ai_msg = {
-                "role": "ai",
-                "content": reply if (reply and reply.strip()) else "[empty response]",
-                "ts": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
-            }
-            st.session_state["messages"].append(ai_msg)
-            st.session_state["logger"].log(ai_msg["role"], ai_msg["content"])
-
-            # Enforce cap (keep most recent messages)
-            if len(st.session_state["messages"]) > MAX_MESSAGES:
-                st.session_state["messages"] = st.session_state["messages"][-MAX_MESSAGES:]
+            st.session_state["messages"].append(user_msg)
+            _start_turn()
 
         # Re-render immediately so the new messages show up
         st.rerun()
@@ -12,10 +12,19 @@ class Config:
     - Uses python-dotenv to load variables into the process environment.
     """
 
-    def __init__(self, env_path: Path, log_enabled: bool, log_file: Path) -> None:
+    def __init__(
+        self,
+        env_path: Path,
+        log_enabled: bool,
+        log_file: Path,
+        log_max_chars: int = 4096,
+        log_spill_dir: Optional[Path] = None,
+    ) -> None:
         self.env_path = env_path
         self.log_enabled = log_enabled
         self.log_file = log_file
+        self.log_max_chars = log_max_chars
+        self.log_spill_dir = log_spill_dir
 
     @staticmethod
     def _env_bool(name: str, default: str = "false") -> bool:
@@ -32,7 +41,19 @@ class Config:
 
         log_enabled = cls._env_bool("LOG_ENABLED", "false")
         log_file = Path(os.getenv("LOG_FILE", "log.txt").strip())
-        return cls(env_path=env_path, log_enabled=log_enabled, log_file=log_file)
+        # Longer chat contents are logged as an excerpt + hash (0 disables the cap)
+        try:
+            log_max_chars = max(0, int(os.getenv("LOG_MAX_CHARS", "4096").strip()))
+        except ValueError:
+            log_max_chars = 4096
+        spill = os.getenv("LOG_SPILL_DIR", "").strip()
+        return cls(
+            env_path=env_path,
+            log_enabled=log_enabled,
+            log_file=log_file,
+            log_max_chars=log_max_chars,
+            log_spill_dir=Path(spill) if spill else None,
+        )
 
 
 def get_openai_config(base_dir: Optional[Path] = None) -> dict:
@@ -81,3 +102,118 @@ def get_ai_backend(base_dir: Optional[Path] = None) -> str:
     """Return AI_BACKEND from env (defaults to 'gpt'), ensuring .env is loaded."""
     Config.load(base_dir=base_dir)
     return os.getenv("AI_BACKEND", "gpt").strip().lower() or "gpt"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def get_ai_executor_config(base_dir: Optional[Path] = None) -> dict:
+    """Return sizing for the shared AI executor, ensuring .env is loaded.
+
+    Returns a dict with keys: {"max_workers", "max_queue", "poll_interval"} from
+    AI_MAX_WORKERS (default 4), AI_MAX_QUEUE (default 16) and AI_POLL_INTERVAL
+    seconds (default 0.5).
+    """
+    Config.load(base_dir=base_dir)
+    try:
+        poll_interval = float(os.getenv("AI_POLL_INTERVAL", "0.5").strip())
+    except ValueError:
+        poll_interval = 0.5
+    return {
+        "max_workers": max(1, _env_int("AI_MAX_WORKERS", 4)),
+        "max_queue": max(0, _env_int("AI_MAX_QUEUE", 16)),
+        "poll_interval": poll_interval if poll_interval > 0 else 0.5,
+    }
+
+
+def get_usage_config(base_dir: Optional[Path] = None) -> dict:
+    """Return token accounting settings, ensuring .env is loaded.
+
+    Returns a dict with keys: {"flush_secs", "session_budget", "budget_mode"} from
+    USAGE_FLUSH_SECS (default 60), TOKEN_BUDGET_PER_SESSION (default 0, disabled)
+    and TOKEN_BUDGET_MODE ("reject" or "trim", default "reject").
+    """
+    Config.load(base_dir=base_dir)
+    mode = os.getenv("TOKEN_BUDGET_MODE", "reject").strip().lower()
+    return {
+        "flush_secs": max(1, _env_int("USAGE_FLUSH_SECS", 60)),
+        "session_budget": max(0, _env_int("TOKEN_BUDGET_PER_SESSION", 0)),
+        "budget_mode": mode if mode in ("reject", "trim") else "reject",
+    }
+
+
+def get_warmup_config(base_dir: Optional[Path] = None) -> dict:
+    """Return connection warm-up settings, ensuring .env is loaded.
+
+    Returns a dict with keys: {"enabled", "keepalive_secs"} from OPENAI_WARMUP
+    (default false) and OPENAI_KEEPALIVE_SECS (default 60; 0 disables keep-alive).
+    """
+    Config.load(base_dir=base_dir)
+    return {
+        "enabled": Config._env_bool("OPENAI_WARMUP", "false"),
+        "keepalive_secs": max(0, _env_int("OPENAI_KEEPALIVE_SECS", 60)),
+    }
+
+
+def get_cassette_config(base_dir: Optional[Path] = None) -> dict:
+    """Return record/replay settings, ensuring .env is loaded.
+
+    Returns a dict with keys: {"path", "realtime", "full_history"} from
+    AI_CASSETTE (default cassettes/session.ndjson; a .gz suffix enables gzip),
+    AI_REPLAY_REALTIME (default false: replay at full speed) and
+    AI_CASSETTE_FULL (default false: record only the new messages per request).
+    """
+    Config.load(base_dir=base_dir)
+    path = os.getenv("AI_CASSETTE", "").strip() or "cassettes/session.ndjson"
+    return {
+        "path": Path(path),
+        "realtime": Config._env_bool("AI_REPLAY_REALTIME", "false"),
+        "full_history": Config._env_bool("AI_CASSETTE_FULL", "false"),
+    }
+
+
+def get_semantic_cache_config(base_dir: Optional[Path] = None) -> dict:
+    """Return near-duplicate prompt cache settings, ensuring .env is loaded.
+
+    Returns a dict with keys: {"enabled", "threshold", "capacity", "context", "dim"}
+    from SEMANTIC_CACHE (default false), SEMANTIC_CACHE_THRESHOLD (cosine, default
+    0.97), SEMANTIC_CACHE_SIZE (entries, default 1024), SEMANTIC_CACHE_CONTEXT
+    (prior messages embedded with the last user turn, default 2) and
+    SEMANTIC_CACHE_DIM (hashed vector size, default 2048).
+    """
+    Config.load(base_dir=base_dir)
+    try:
+        threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97").strip())
+    except ValueError:
+        threshold = 0.97
+    return {
+        "enabled": Config._env_bool("SEMANTIC_CACHE", "false"),
+        "threshold": min(max(threshold, 0.0), 1.0),
+        "capacity": max(1, _env_int("SEMANTIC_CACHE_SIZE", 1024)),
+        "context": max(0, _env_int("SEMANTIC_CACHE_CONTEXT", 2)),
+        "dim": max(64, _env_int("SEMANTIC_CACHE_DIM", 2048)),
+    }
+
+
+def get_gateway_config(base_dir: Optional[Path] = None) -> dict:
+    """Return local inference gateway settings, ensuring .env is loaded.
+
+    Returns a dict with keys: {"address", "backend", "token", "timeout", "idle"} from
+    AI_GATEWAY_ADDR ("host:port" on loopback or "unix:/path", default
+    127.0.0.1:8765), AI_GATEWAY_BACKEND (backend hosted by the gateway, default
+    gpt), AI_GATEWAY_TOKEN (shared secret sent with every request; the gateway
+    refuses to start without one), AI_GATEWAY_TIMEOUT seconds (default 120) and AI_GATEWAY_IDLE_SECS
+    (server closes connections idle this long, default 300).
+    """
+    Config.load(base_dir=base_dir)
+    return {
+        "address": os.getenv("AI_GATEWAY_ADDR", "").strip() or "127.0.0.1:8765",
+        "backend": os.getenv("AI_GATEWAY_BACKEND", "").strip().lower() or "gpt",
+        "token": os.getenv("AI_GATEWAY_TOKEN", "").strip(),
+        "timeout": max(1, _env_int("AI_GATEWAY_TIMEOUT", 120)),
+        "idle": max(1, _env_int("AI_GATEWAY_IDLE_SECS", 300)),
+    }
@@ -4,18 +4,24 @@ Responsibilities:
 - Load logging config from env via Config.load() (LOG_ENABLED, LOG_FILE).
 - Provide two write-only methods: log() for chat lines, event() for app events.
 - Write timestamps in UTC ISO-8601 with seconds precision.
+- Keep lines bounded: oversized chat contents are logged as an excerpt plus a
+  content hash, optionally spilling the full text to LOG_SPILL_DIR.
 """
 
 from __future__ import annotations
 
-import os
 import datetime as dt
+import hashlib
 from pathlib import Path
-import re
 from typing import Optional
 from config import Config
 
 
+def _one_line(text: str) -> str:
+    """Collapse all whitespace runs (incl. CR/LF) to single spaces and strip, in one pass."""
+    return " ".join(text.split())
+
+
 class ChatLogger:
     """Simple, file-based logger for chat messages and app events.
 
@@ -48,14 +54,31 @@ class ChatLogger:
             return
 
         timestamp = dt.datetime.now(dt.UTC).isoformat(timespec="seconds")
-        # Replace newlines/CR with spaces, then collapse runs of whitespace
-        safe_content = content.replace("\r", " ").replace("\n", " ")
-        safe_content = re.sub(r"\s+", " ", safe_content).strip()
+        cap = self._CFG.log_max_chars
+        if cap and len(content) > cap:
+            safe_content = self._excerpt(content, cap)
+        else:
+            safe_content = _one_line(content)
         line = f"[{timestamp}] {role}: {safe_content}\n"
 
         with self._path.open("a", encoding="utf-8") as fh:
             fh.write(line)
 
+    def _excerpt(self, content: str, cap: int) -> str:
+        """Summarize oversized content: normalized prefix, size, hash and optional spill file."""
+        data = content.encode("utf-8", errors="surrogatepass")
+        digest = hashlib.sha256(data).hexdigest()
+        note = f"chars={len(content)} sha256={digest}"
+        spill_dir = self._CFG.log_spill_dir
+        if spill_dir is not None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            spill_path = spill_dir / f"{digest}.txt"
+            if not spill_path.exists():
+                spill_path.write_bytes(data)
+            note += f" spill={spill_path}"
+        # Only the prefix is normalized; the rest of the content is never scanned again
+        return f"{_one_line(content[:cap])} ...[truncated {note}]"
+
     def event(self, name: str, **fields: str) -> None:
         """Log a structured app event as a single line.
 
@@ -67,9 +90,7 @@ class ChatLogger:
         timestamp = dt.datetime.now(dt.UTC).isoformat(timespec="seconds")
         parts = []
         for k, v in fields.items():
-            val = str(v).replace("\n", " ").replace("\r", " ")
-            val = re.sub(r"\s+", " ", val).strip()
-            parts.append(f"{k}={val}")
+            parts.append(f"{k}={_one_line(str(v))}")
         line = f"[{timestamp}] event:{name} " + " ".join(parts) + "\n"
         with self._path.open("a", encoding="utf-8") as fh:
             fh.write(line)
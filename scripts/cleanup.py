@@ -7,14 +7,23 @@ This script recursively searches for and removes:
 - Other common temporary files and directories
 
 Usage:
-    python cleanup.py [root_dir] [-y/--yes]
+    python cleanup.py [root_dir] [-y/--yes] [-j/--workers N]
 """
 import os
-import glob
+import re
+import json
+import stat
+import fnmatch
+import hashlib
+import sqlite3
+import sys
+import time
 import shutil
 import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing
 from pathlib import Path
-from typing import List, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
 import argparse
 
 # Configure logging with f-strings
@@ -54,79 +63,416 @@ def get_temp_dirs() -> List[str]:
         ".vscode",
     ]
 
-def load_gitignore_patterns(root_dir: Path) -> Tuple[List[str], List[str]]:
-    """Parse .gitignore into simple file and dir patterns.
+PROTECTED_DIRS = {".git", ".github"}
 
-    Note: This is a best-effort parser; it ignores negations and anchors.
+def _compile_names(patterns: List[str], suffix: str = "") -> Callable[[str], Optional[str]]:
+    """Compile fnmatch-style name patterns into one regex.
+
+    Returns a callable mapping a name to the pattern it matched (plus
+    `suffix`), or None.
     """
-    gi_file = root_dir / ".gitignore"
-    file_pats: List[str] = []
-    dir_pats: List[str] = []
-    if not gi_file.exists():
-        return file_pats, dir_pats
-    for raw in gi_file.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        # Skip negations and git-specific patterns we won't handle
-        if line.startswith("!"):
+    if not patterns:
+        return lambda name: None
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    regex = re.compile("|".join(f"(?P<p{i}>{fnmatch.translate(p)})" for i, p in enumerate(patterns)), flags)
+
+    def _match(name: str) -> Optional[str]:
+        m = regex.match(name)
+        return patterns[int(m.lastgroup[1:])] + suffix if m else None
+
+    return _match
+
+def _translate_gitignore(pattern: str) -> str:
+    """Translate a gitignore glob into a regex body (no anchors).
+
+    `*` and `?` never cross `/`; `**` spans directories only as a whole
+    path segment (`**/x`, `x/**`, `a/**/b`), otherwise it acts like `*`.
+    """
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**" and (i == 0 or pattern[i - 1] == "/"):
+                j = i + 2
+                if j == n:
+                    out.append(".*")
+                    i = j
+                    continue
+                if pattern[j] == "/":
+                    out.append("(?:.*/)?")
+                    i = j + 1
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
             continue
-        # Treat trailing slash as directory pattern
-        if line.endswith("/"):
-            dir_pats.append(line.rstrip("/"))
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "^", "]") else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append(f"(?!/)[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
         else:
-            # Normalize common leading './'
-            file_pats.append(line.lstrip("./"))
-    return file_pats, dir_pats
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+class GitIgnore:
+    """Compiled rules of one ignore file, matched relative to its directory.
 
-def find_cleanup_targets(root_dir: str, include_gitignore: bool = False) -> Tuple[Set[str], Set[str]]:
+    Supports comments, escapes, trailing-space trimming, `!` negation,
+    anchoring (any `/` other than a trailing one), `**` and directory-only
+    rules (trailing `/`). Rules are kept in reverse so the last match wins.
+    Each rule is labelled `source:line:pattern`, like `git check-ignore -v`.
     """
-    Find all files and directories that should be cleaned up.
+
+    def __init__(self, base: str = "", source: str = ".gitignore") -> None:
+        self.base = base
+        self.source = source
+        self._rules: List[Tuple["re.Pattern[str]", bool, bool, bool, str]] = []
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], base: str = "", source: str = ".gitignore") -> "GitIgnore":
+        gi = cls(base, source)
+        for lineno, raw in enumerate(lines, start=1):
+            gi._add(raw, lineno)
+        gi._rules.reverse()
+        return gi
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "", source: Optional[str] = None) -> Optional["GitIgnore"]:
+        """Parse an ignore file; return None when it is missing or has no rules."""
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        if source is None:
+            source = f"{base}/{path.name}" if base else path.name
+        gi = cls.parse(text.splitlines(), base, source)
+        return gi if gi._rules else None
+
+    def _add(self, raw: str, lineno: int = 0) -> None:
+        line = raw.rstrip("\r")
+        label = f"{self.source}:{lineno}:{line.strip()}"
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "  # "\ " keeps one escaped trailing space
+        line = stripped
+        if not line or line.startswith("#"):
+            return
+        negate = line.startswith("!")
+        if negate or line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return
+        anchored = "/" in line
+        regex = re.compile(_translate_gitignore(line.lstrip("/")) + r"\Z", re.DOTALL)
+        self._rules.append((regex, negate, dir_only, anchored, label))
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if ignored, False if re-included, None if no rule applies.
+
+        Args:
+            rel_path: POSIX path relative to the scan root
+            is_dir: Whether the path is a directory
+        """
+        rule = self.rule_for(rel_path, is_dir)
+        return None if rule is None else rule[0]
+
+    def rule_for(self, rel_path: str, is_dir: bool) -> Optional[Tuple[bool, str]]:
+        """Return (ignored, rule label) for the last matching rule, or None."""
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        name = rel_path.rpartition("/")[2]
+        for regex, negate, dir_only, anchored, label in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                return not negate, label
+        return None
+
+def gitignore_rule(chain: Tuple[GitIgnore, ...], rel_path: str, is_dir: bool) -> Optional[str]:
+    """Return the label of the rule ignoring a path, or None if it is not ignored.
+
+    Nested ignore files are consulted deepest first; the first verdict wins.
+    """
+    for gi in reversed(chain):
+        rule = gi.rule_for(rel_path, is_dir)
+        if rule is not None:
+            return rule[1] if rule[0] else None
+    return None
+
+INDEX_NAME = ".cleanup-index.sqlite"
+INDEX_VERSION = 2
+
+# (dir mtime_ns, gitignore chain key, [(file, size, rule)], [(dir, rule)], [subdirs entered])
+IndexRecord = Tuple[int, str, List[Tuple[str, int, str]], List[Tuple[str, str]], List[str]]
+
+class ScanIndex:
+    """Persisted per-directory scan results keyed by directory mtime.
+
+    Adding, removing or renaming an entry changes its parent directory's
+    mtime, so a directory whose mtime (and effective .gitignore rules) are
+    unchanged still has the same names: its previous matches are reused and
+    only its recorded subdirectories are visited. Reused file sizes are as of
+    the run that recorded them.
+    """
+
+    def __init__(self, path: Path, signature: str) -> None:
+        self.path = path
+        self.signature = signature
+        self.records: Dict[str, IndexRecord] = {}
+        self.updated: Dict[str, IndexRecord] = {}
+        self.visited = 0
+        self.reused = 0
+        self._corrupt = False
+
+    @staticmethod
+    def signature_for(include_gitignore: bool) -> str:
+        """Identify the matching rules; an index built under other rules is discarded."""
+        return json.dumps([INDEX_VERSION, get_temp_patterns(), get_temp_dirs(), include_gitignore])
+
+    @classmethod
+    def load(cls, root_dir: str, include_gitignore: bool = False) -> "ScanIndex":
+        index = cls(Path(root_dir).resolve() / INDEX_NAME, cls.signature_for(include_gitignore))
+        if not index.path.exists():
+            return index
+        try:
+            with closing(sqlite3.connect(index.path)) as db:
+                row = db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+                if row and row[0] == index.signature:
+                    for rel, mtime_ns, chain, payload in db.execute("SELECT rel, mtime_ns, chain, payload FROM dirs"):
+                        files, dirs, subdirs = json.loads(payload)
+                        index.records[rel] = (
+                            mtime_ns, chain, [tuple(f) for f in files], [tuple(d) for d in dirs], subdirs
+                        )
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scan index {index.path}: {e}")
+            index.records = {}
+            index._corrupt = True
+        return index
+
+    def save(self) -> None:
+        """Replace the stored records with those produced by the latest scan."""
+        if self._corrupt:
+            self.path.unlink(missing_ok=True)
+        with closing(sqlite3.connect(self.path)) as db:
+            # No journal file: creating/removing one would bump the root's mtime every run
+            db.execute("PRAGMA journal_mode = MEMORY")
+            with db:
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS dirs "
+                    "(rel TEXT PRIMARY KEY, mtime_ns INTEGER, chain TEXT, payload TEXT)"
+                )
+                db.execute("DELETE FROM dirs")
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (self.signature,))
+                db.executemany(
+                    "INSERT INTO dirs VALUES (?, ?, ?, ?)",
+                    (
+                        (rel, mtime_ns, chain, json.dumps([files, dirs, subdirs], separators=(",", ":")))
+                        for rel, (mtime_ns, chain, files, dirs, subdirs) in self.updated.items()
+                    ),
+                )
+
+def _chain_key(parent_key: str, gitignore_path: Path) -> str:
+    """Fingerprint the ignore rules in effect for a directory (parent rules + own file)."""
+    try:
+        st = gitignore_path.stat()
+    except OSError:
+        return parent_key
+    token = f"{parent_key}|{gitignore_path}:{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=8).hexdigest()
+
+def iter_cleanup_targets(
+    root_dir: str,
+    include_gitignore: bool = False,
+    index: Optional[ScanIndex] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield cleanup targets as they are found.
+
+    The tree is walked once, top-down. A matching directory is reported as a
+    whole and not entered, so nothing beneath it is scanned (git itself never
+    re-includes paths under an ignored directory).
     
     Args:
         root_dir: Root directory to start search from
+        include_gitignore: Also match rules from .git/info/exclude and every
+            .gitignore found during the walk
+        index: Optional ScanIndex; unchanged directories are taken from
+            `index.records` and every visited directory is written to `index.updated`
         
-    Returns:
-        Tuple of (files to delete, directories to delete)
+    Yields:
+        {"path", "type" ("file" | "dir"), "size" (None for dirs), "rule"}
     """
-    files_to_delete: Set[str] = set()
-    dirs_to_delete: Set[str] = set()
     root_path = Path(root_dir).resolve()
     
     logger.info(f"Scanning directory: {root_path}")
+
+    file_rule = _compile_names(get_temp_patterns())
+    dir_rule = _compile_names([p for p in get_temp_dirs() if p not in PROTECTED_DIRS], suffix="/")
+    root_chain: Tuple[GitIgnore, ...] = ()
+    root_key = ""
+    if include_gitignore:
+        exclude_path = root_path / ".git" / "info" / "exclude"
+        exclude = GitIgnore.from_file(exclude_path, source=".git/info/exclude")
+        root_chain = (exclude,) if exclude else ()
+        # Exclude rules apply everywhere, so they seed every directory's chain key
+        root_key = _chain_key("", exclude_path)
+    if index is not None:
+        index.updated = {}
+        index.visited = index.reused = 0
     
     try:
-        # Get the patterns
-        file_patterns = get_temp_patterns()
-        dir_patterns = get_temp_dirs()
-        if include_gitignore:
-            gi_files, gi_dirs = load_gitignore_patterns(root_path)
-            file_patterns += gi_files
-            dir_patterns += gi_dirs
-        
-        # Walk through directory tree
-        for current_dir, subdirs, files in os.walk(root_path, topdown=False):
-            current_path = Path(current_dir)
-            
-            # Check for matching directories
-            for dir_pattern in dir_patterns:
-                # Skip protected dirs
-                if dir_pattern in {".git", ".github"}:
+        stack: List[Tuple[str, str, Tuple[GitIgnore, ...], str]] = [(str(root_path), "", root_chain, root_key)]
+        while stack:
+            current, rel_dir, chain, chain_key = stack.pop()
+            if include_gitignore:
+                gi_path = Path(current) / ".gitignore"
+                gi = GitIgnore.from_file(gi_path, rel_dir)
+                if gi is not None:
+                    chain = chain + (gi,)
+                if index is not None:
+                    chain_key = _chain_key(chain_key, gi_path)
+
+            if index is not None:
+                try:
+                    mtime_ns = os.stat(current).st_mtime_ns
+                except OSError as e:
+                    logger.warning(f"Cannot scan {current}: {e}")
                     continue
-                matching_dirs = current_path.glob(dir_pattern)
-                dirs_to_delete.update(str(d) for d in matching_dirs if d.is_dir())
-            
-            # Check for matching files
-            for pattern in file_patterns:
-                matching_files = current_path.glob(pattern)
-                files_to_delete.update(str(f) for f in matching_files if f.is_file())
+                index.visited += 1
+                record = index.records.get(rel_dir)
+                if record is not None and record[0] == mtime_ns and record[1] == chain_key:
+                    index.reused += 1
+                    index.updated[rel_dir] = record
+                    _, _, rec_files, rec_dirs, rec_subdirs = record
+                    for name, size, rule in rec_files:
+                        yield {"path": os.path.join(current, name), "type": "file", "size": size, "rule": rule}
+                    for name, rule in rec_dirs:
+                        yield {"path": os.path.join(current, name), "type": "dir", "size": None, "rule": rule}
+                    for name in rec_subdirs:
+                        rel = f"{rel_dir}/{name}" if rel_dir else name
+                        stack.append((os.path.join(current, name), rel, chain, chain_key))
+                    continue
+                rec_files, rec_dirs, rec_subdirs = [], [], []
+
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning(f"Cannot scan {current}: {e}")
+                continue
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if rel == INDEX_NAME:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in PROTECTED_DIRS:
+                            continue
+                        rule = dir_rule(entry.name) or (gitignore_rule(chain, rel, True) if chain else None)
+                        if rule:
+                            if index is not None:
+                                rec_dirs.append((entry.name, rule))
+                            yield {"path": entry.path, "type": "dir", "size": None, "rule": rule}
+                        else:
+                            stack.append((entry.path, rel, chain, chain_key))
+                            if index is not None:
+                                rec_subdirs.append(entry.name)
+                        continue
+                    rule = file_rule(entry.name) or (gitignore_rule(chain, rel, False) if chain else None)
+                    if not rule or not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                if index is not None:
+                    rec_files.append((entry.name, size, rule))
+                yield {"path": entry.path, "type": "file", "size": size, "rule": rule}
+            if index is not None:
+                index.updated[rel_dir] = (mtime_ns, chain_key, rec_files, rec_dirs, rec_subdirs)
                 
     except Exception as e:
         logger.error(f"Error while scanning directory: {e}")
         raise
-            
+
+    if index is not None:
+        logger.info(f"Index: skipped {index.reused} of {index.visited} directories (unchanged since last scan)")
+
+def find_cleanup_targets(
+    root_dir: str,
+    include_gitignore: bool = False,
+    sizes: Optional[Dict[str, int]] = None,
+    index: Optional[ScanIndex] = None,
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Find all files and directories that should be cleaned up.
+    
+    Args:
+        root_dir: Root directory to start search from
+        include_gitignore: Also match .gitignore rules (see iter_cleanup_targets)
+        sizes: Optional dict filled with {file path: size} from the scan's stat data
+        index: Optional ScanIndex to reuse and refresh
+        
+    Returns:
+        Tuple of (files to delete, directories to delete)
+    """
+    files_to_delete: Set[str] = set()
+    dirs_to_delete: Set[str] = set()
+    for target in iter_cleanup_targets(root_dir, include_gitignore=include_gitignore, index=index):
+        if target["type"] == "dir":
+            dirs_to_delete.add(target["path"])
+            continue
+        files_to_delete.add(target["path"])
+        if sizes is not None:
+            sizes[target["path"]] = target["size"]
     return files_to_delete, dirs_to_delete
 
+def validate_index(
+    root_dir: str,
+    index: ScanIndex,
+    files: Set[str],
+    dirs: Set[str],
+    sizes: Dict[str, int],
+    include_gitignore: bool = False,
+) -> Tuple[Set[str], Set[str]]:
+    """Compare incremental results with a full scan and rebuild the index from the latter.
+
+    Returns:
+        The full scan's (files, directories); `sizes` is refreshed in place
+    """
+    reused = index.reused
+    index.records = {}
+    sizes.clear()
+    full_files, full_dirs = find_cleanup_targets(
+        root_dir, include_gitignore=include_gitignore, sizes=sizes, index=index
+    )
+    index.reused = reused
+    mismatches = len(files ^ full_files) + len(dirs ^ full_dirs)
+    if mismatches:
+        logger.warning(f"Index validation: {mismatches} paths differ from a full scan; index rebuilt")
+        for path in sorted((files ^ full_files) | (dirs ^ full_dirs)):
+            logger.debug(f"Index mismatch: {path}")
+    else:
+        logger.info(f"Index validation: matches full scan ({reused} directories were skipped)")
+    return full_files, full_dirs
+
 def format_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -135,47 +481,240 @@ def format_size(size_bytes: int) -> str:
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
 
-def calculate_total_size(paths: List[str]) -> int:
-    """Calculate total size of files and directories."""
+class ProgressReporter:
+    """Log throughput (items and bytes per second) at most every `interval` seconds."""
+
+    def __init__(self, label: str, total: int, interval: float = 1.0) -> None:
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.bytes = 0
+        self._start = time.monotonic()
+        self._last = self._start
+
+    def update(self, nbytes: int = 0) -> None:
+        self.done += 1
+        self.bytes += nbytes
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            logger.info(f"{self.label}: {self.done}/{self.total} paths, {self._rate(now)}")
+
+    def finish(self) -> None:
+        now = time.monotonic()
+        logger.info(
+            f"{self.label}: {self.done} paths, {format_size(self.bytes)} "
+            f"in {now - self._start:.2f}s ({self._rate(now)})"
+        )
+
+    def _rate(self, now: float) -> str:
+        elapsed = max(now - self._start, 1e-9)
+        return f"{format_size(self.bytes / elapsed)}/s"
+
+def _run_pool(func: Callable[[str], int], paths: Iterable[str], workers: int, label: str) -> Dict[str, int]:
+    """Apply `func` to each path (serially or on a thread pool) and return {path: result}.
+
+    `func` returns a byte count used for progress reporting.
+    """
+    paths = list(paths)
+    progress = ProgressReporter(label, len(paths))
+    results: Dict[str, int] = {}
+    if workers <= 1:
+        for path in paths:
+            results[path] = func(path)
+            progress.update(max(results[path], 0))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(func, path): path for path in paths}
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+                progress.update(max(results[futures[fut]], 0))
+    progress.finish()
+    return results
+
+def _dir_size(path: str) -> int:
+    """Sum file sizes under a directory using one scandir stat per entry."""
     total = 0
-    for path in paths:
+    stack = [path]
+    while stack:
+        current = stack.pop()
         try:
-            if os.path.isfile(path):
-                total += os.path.getsize(path)
-            elif os.path.isdir(path):
-                for dirpath, _, filenames in os.walk(path):
-                    for f in filenames:
-                        fp = os.path.join(dirpath, f)
-                        if os.path.exists(fp):  # Check if file still exists
-                            total += os.path.getsize(fp)
-        except (OSError, PermissionError) as e:
-            logger.warning(f"Error calculating size for {path}: {e}")
-            continue
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Error calculating size for {current}: {e}")
     return total
 
-def delete_paths(paths: Set[str], is_dir: bool = False) -> List[str]:
+def _path_size(path: str) -> int:
+    """Return the size of a file or the recursive size of a directory."""
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        logger.warning(f"Error calculating size for {path}: {e}")
+        return 0
+    return _dir_size(path) if stat.S_ISDIR(st.st_mode) else st.st_size
+
+def calculate_total_size(
+    paths: List[str],
+    sizes: Optional[Dict[str, int]] = None,
+    workers: int = 1,
+) -> int:
+    """Calculate total size of files and directories.
+
+    Args:
+        paths: File and directory paths to size
+        sizes: Known sizes (e.g. from find_cleanup_targets); missing paths are
+            measured and added to this dict
+        workers: Number of threads used to measure unknown paths
+
+    Returns:
+        Total size in bytes
+    """
+    if sizes is None:
+        sizes = {}
+    pending = [p for p in paths if p not in sizes]
+    if pending:
+        sizes.update(_run_pool(_path_size, pending, workers, "Sizing"))
+    return sum(sizes.get(p, 0) for p in paths)
+
+def _outermost(paths: Iterable[str]) -> List[str]:
+    """Drop paths nested under another path in the set (parents remove them anyway)."""
+    wanted = set(paths)
+    return [p for p in wanted if not any(str(a) in wanted for a in Path(p).parents)]
+
+def delete_paths(
+    paths: Set[str],
+    is_dir: bool = False,
+    workers: int = 1,
+    sizes: Optional[Dict[str, int]] = None,
+) -> List[str]:
     """
     Delete files or directories and return list of successfully deleted paths.
     
     Args:
         paths: Set of paths to delete
         is_dir: True if paths are directories, False if files
+        workers: Number of threads used for deletion
+        sizes: Optional known sizes, used for bytes-per-second reporting
         
     Returns:
         List of successfully deleted paths
     """
-    deleted = []
-    for path in paths:
+    known = sizes or {}
+
+    def _delete(path: str) -> int:
         try:
             if is_dir:
                 shutil.rmtree(path)
             else:
                 os.remove(path)
-            deleted.append(path)
-            logger.debug(f"Successfully deleted: {path}")
         except OSError as e:
             logger.error(f"Error deleting {path}: {e}")
-    return deleted
+            return -1
+        logger.debug(f"Successfully deleted: {path}")
+        return known.get(path, 0)
+
+    label = "Deleting directories" if is_dir else "Deleting files"
+    # Nested directories would race their parent's rmtree on the pool
+    targets = _outermost(paths) if is_dir else paths
+    results = _run_pool(_delete, targets, workers, label)
+    return [path for path, nbytes in results.items() if nbytes >= 0]
+
+def _with_size(target: Dict[str, Any]) -> Dict[str, Any]:
+    if target["size"] is None:
+        target["size"] = _path_size(target["path"])
+    return target
+
+def iter_sized_targets(targets: Iterable[Dict[str, Any]], workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """Fill in directory sizes while passing targets through.
+
+    With several workers, directories are sized on a pool and emitted as they
+    finish (so output order is not preserved); at most `4 * workers` are in flight.
+    """
+    if workers <= 1:
+        for target in targets:
+            yield _with_size(target)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        for target in targets:
+            if target["size"] is not None:
+                yield target
+                continue
+            pending.add(pool.submit(_with_size, target))
+            if len(pending) >= 4 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in as_completed(pending):
+            yield fut.result()
+
+def write_ndjson(records: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write one JSON object per line and return how many were written."""
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+def summarize_targets(targets: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate targets into per-rule {"rule", "count", "bytes"} rows, largest first."""
+    totals: Dict[str, List[int]] = {}
+    for target in targets:
+        row = totals.setdefault(target["rule"], [0, 0])
+        row[0] += 1
+        row[1] += target["size"] or 0
+    rows = [{"rule": rule, "count": c, "bytes": b} for rule, (c, b) in totals.items()]
+    return sorted(rows, key=lambda r: r["bytes"], reverse=True)
+
+def load_plan(lines: Iterable[str], root_dir: str) -> Tuple[Set[str], Set[str], Dict[str, int]]:
+    """Read NDJSON targets (as written by --ndjson) into a deletion plan.
+
+    The root is resolved the same way the scan resolves it. Each path's parent
+    is resolved too, and paths reached through a symlinked directory, outside
+    the root or inside a protected directory are skipped.
+
+    Returns:
+        Tuple of (files, directories, {path: size})
+    """
+    root = str(Path(root_dir).resolve())
+    files: Set[str] = set()
+    dirs: Set[str] = set()
+    sizes: Dict[str, int] = {}
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            target = json.loads(line)
+            path = os.path.abspath(target["path"])
+            kind = target["type"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Skipping invalid plan line {lineno}: {e}")
+            continue
+        parent = os.path.dirname(path)
+        real_parent = os.path.realpath(parent)
+        if real_parent != parent:
+            logger.warning(f"Skipping plan path under a symlinked directory: {path}")
+            continue
+        path = os.path.join(real_parent, os.path.basename(path))
+        if path == root or os.path.commonpath([root, path]) != root:
+            logger.warning(f"Skipping plan path outside {root}: {path}")
+            continue
+        if PROTECTED_DIRS.intersection(Path(os.path.relpath(path, root)).parts):
+            logger.warning(f"Skipping protected plan path: {path}")
+            continue
+        (dirs if kind == "dir" else files).add(path)
+        if target.get("size") is not None:
+            sizes[path] = int(target["size"])
+    return files, dirs, sizes
 
 def prune_empty_dirs(root_dir: str) -> List[str]:
     """Remove empty directories under root, excluding .git and .github."""
@@ -192,6 +731,35 @@ def prune_empty_dirs(root_dir: str) -> List[str]:
             continue
     return pruned
 
+def stream_targets(root_dir: str, args: argparse.Namespace, out: TextIO = sys.stdout) -> None:
+    """Scan and emit targets as NDJSON, or only a per-rule summary, without deleting."""
+    index = ScanIndex.load(root_dir, args.gitignore) if args.incremental else None
+    targets = iter_sized_targets(
+        iter_cleanup_targets(root_dir, include_gitignore=args.gitignore, index=index), workers=args.workers
+    )
+    if args.summary:
+        rows = summarize_targets(targets)
+        if args.ndjson:
+            write_ndjson(rows, out)
+        else:
+            for row in rows:
+                out.write(f"{row['count']:>10}  {format_size(row['bytes']):>10}  {row['rule']}\n")
+        count = sum(r["count"] for r in rows)
+        total = sum(r["bytes"] for r in rows)
+    else:
+        total = 0
+
+        def _tally(items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            nonlocal total
+            for item in items:
+                total += item["size"] or 0
+                yield item
+
+        count = write_ndjson(_tally(targets), out)
+    if index is not None:
+        index.save()
+    logger.info(f"Found {count} targets, {format_size(total)}")
+
 def main() -> None:
     """Main entry point for the cleanup script."""
     parser = argparse.ArgumentParser(
@@ -211,13 +779,44 @@ def main() -> None:
     parser.add_argument(
         "-g", "--gitignore",
         action="store_true",
-        help="Also delete files/dirs matched by patterns in .gitignore (best-effort)"
+        help="Also delete files/dirs ignored by .gitignore files (nested, with negation)"
     )
     parser.add_argument(
         "--prune-empty",
         action="store_true",
         help="Prune empty directories after deletion"
     )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=1,
+        help="Threads used for sizing and deletion (default: 1, serial)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Reuse and update a scan index ({INDEX_NAME}) to skip unchanged directories"
+    )
+    parser.add_argument(
+        "--validate-index",
+        action="store_true",
+        help="With --incremental, also run a full scan, report differences and rebuild the index"
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream targets to stdout as NDJSON (path, type, size, rule) while scanning; nothing is deleted"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Only print per-rule counts and bytes (as NDJSON with --ndjson); nothing is deleted"
+    )
+    parser.add_argument(
+        "--plan",
+        metavar="FILE",
+        help="Delete the targets listed in an NDJSON plan (from --ndjson; '-' reads stdin) instead of scanning"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -229,12 +828,36 @@ def main() -> None:
     if args.verbose:
         logger.setLevel(logging.DEBUG)
     
-    root_dir = os.path.abspath(args.root_dir)
+    # Resolved like the scan does, so --ndjson output and --plan input agree
+    root_dir = str(Path(args.root_dir).resolve())
     logger.info(f"Starting cleanup in: {root_dir}")
     
     try:
-        # Find all targets
-    files_to_delete, dirs_to_delete = find_cleanup_targets(root_dir, include_gitignore=args.gitignore)
+        sizes: Dict[str, int] = {}
+        if args.plan:
+            if args.plan == "-":
+                if not args.yes:
+                    parser.error("--plan - reads stdin, so it needs -y/--yes")
+                files_to_delete, dirs_to_delete, sizes = load_plan(sys.stdin, root_dir)
+            else:
+                with open(args.plan, encoding="utf-8") as fh:
+                    files_to_delete, dirs_to_delete, sizes = load_plan(fh, root_dir)
+            logger.info(f"Loaded plan: {len(files_to_delete)} files, {len(dirs_to_delete)} directories")
+        elif args.ndjson or args.summary:
+            stream_targets(root_dir, args)
+            return
+        else:
+            # Find all targets (file sizes are captured from the scan's stat calls)
+            index = ScanIndex.load(root_dir, args.gitignore) if (args.incremental or args.validate_index) else None
+            files_to_delete, dirs_to_delete = find_cleanup_targets(
+                root_dir, include_gitignore=args.gitignore, sizes=sizes, index=index
+            )
+            if index is not None and args.validate_index:
+                files_to_delete, dirs_to_delete = validate_index(
+                    root_dir, index, files_to_delete, dirs_to_delete, sizes, include_gitignore=args.gitignore
+                )
+            if index is not None:
+                index.save()
         
         if not files_to_delete and not dirs_to_delete:
             logger.info("No files or directories to clean up!")
@@ -242,18 +865,19 @@ def main() -> None:
         
         # Calculate total size
         all_paths = list(files_to_delete) + list(dirs_to_delete)
-        total_size = calculate_total_size(all_paths)
+        total_size = calculate_total_size(all_paths, sizes=sizes, workers=args.workers)
         
-        # Show what will be deleted
-        if files_to_delete:
-            print("\nFiles to be deleted:")
-            for f in sorted(files_to_delete):
-                print(f"  - {f}")
-        
-        if dirs_to_delete:
-            print("\nDirectories to be deleted:")
-            for d in sorted(dirs_to_delete):
-                print(f"  - {d}")
+        # Show what will be deleted (a plan was already reviewed as NDJSON)
+        if not args.plan:
+            if files_to_delete:
+                print("\nFiles to be deleted:")
+                for f in sorted(files_to_delete):
+                    print(f"  - {f}")
+            
+            if dirs_to_delete:
+                print("\nDirectories to be deleted:")
+                for d in sorted(dirs_to_delete):
+                    print(f"  - {d}")
             
         print(f"\nTotal space to be freed: {format_size(total_size)}")
         
@@ -265,8 +889,8 @@ def main() -> None:
                 return
         
         # Delete files and directories
-        deleted_files = delete_paths(files_to_delete)
-        deleted_dirs = delete_paths(dirs_to_delete, is_dir=True)
+        deleted_files = delete_paths(files_to_delete, workers=args.workers, sizes=sizes)
+        deleted_dirs = delete_paths(dirs_to_delete, is_dir=True, workers=args.workers, sizes=sizes)
 
         pruned_dirs: List[str] = []
         if args.prune_empty:
@@ -70,3 +70,26 @@ def test_ai_gpt_retries_once_and_succeeds(monkeypatch):
     ai = AI_GPT()
     reply = ai.generate_reply([{"role": "user", "content": "retry?"}])
     assert reply == "recovered"
+
+
+def test_ai_gpt_records_usage(monkeypatch):
+    from ai import gpt as gpt_mod
+    from ai.usage import UsageMeter
+
+    class _UsageClient:
+        class chat:
+            class completions:
+                @staticmethod
+                def create(**kwargs):
+                    usage = types.SimpleNamespace(prompt_tokens=12, completion_tokens=3)
+                    return types.SimpleNamespace(choices=[_FakeChoiceMsg("ok")], usage=usage)
+
+    meter = UsageMeter(flush_secs=3600)
+    monkeypatch.setattr(gpt_mod, "get_usage_meter", lambda: meter)
+    monkeypatch.setattr(
+        gpt_mod, "get_openai_config", lambda: {"api_key": "x", "model": "gpt-test", "client": _UsageClient()}
+    )
+
+    ai = AI_GPT()
+    assert ai.generate_reply([{"role": "user", "content": "hi"}], context={"session_id": "abc"}) == "ok"
+    assert meter.session_total("abc") == 15
@@ -0,0 +1,78 @@
+import sys
+import time
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+import pytest
+
+from ai.base import AI
+from ai.cassette import AI_Record, AI_Replay, iter_cassette
+
+
+class _EchoAI(AI):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+
+    def generate_reply(self, messages, context=None):
+        time.sleep(self.delay)
+        if messages[-1]["content"] == "boom":
+            raise ValueError("bad request")
+        return "echo: " + messages[-1]["content"]
+
+
+@pytest.mark.parametrize("name", ["session.ndjson", "session.ndjson.gz"])
+def test_record_then_replay(tmp_path, name):
+    path = tmp_path / name
+    rec = AI_Record(_EchoAI(), path)
+    assert rec.generate_reply([{"role": "user", "content": "hi"}]) == "echo: hi"
+    with pytest.raises(ValueError):
+        rec.generate_reply([{"role": "user", "content": "boom"}])
+
+    entries = list(iter_cassette(path))
+    assert entries[0]["messages"] == [{"role": "user", "content": "hi"}]
+    assert entries[0]["chunks"][0][1] == "echo: hi"
+    assert "error" in entries[1]
+
+    replay = AI_Replay(path)
+    # Extra app keys (ts) and the "ai" role alias do not change the lookup key
+    assert replay.generate_reply([{"role": "user", "content": "hi", "ts": "x"}]) == "echo: hi"
+    with pytest.raises(RuntimeError, match="bad request"):
+        replay.generate_reply([{"role": "user", "content": "boom"}])
+    with pytest.raises(LookupError):
+        replay.generate_reply([{"role": "user", "content": "unseen"}])
+
+
+def test_replay_realtime_reproduces_latency(tmp_path):
+    path = tmp_path / "c.ndjson"
+    AI_Record(_EchoAI(delay=0.05), path).generate_reply([{"role": "user", "content": "slow"}])
+
+    t0 = time.perf_counter()
+    AI_Replay(path).generate_reply([{"role": "user", "content": "slow"}])
+    fast = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    AI_Replay(path, realtime=True).generate_reply([{"role": "user", "content": "slow"}])
+    assert time.perf_counter() - t0 >= 0.05 > fast
+
+
+@pytest.mark.parametrize("full_history", [False, True])
+def test_record_stores_only_new_messages_unless_full_history(tmp_path, full_history):
+    path = tmp_path / "c.ndjson"
+    rec = AI_Record(_EchoAI(), path, full_history=full_history)
+    history = [{"role": "user", "content": "x" * 1000}]
+    for turn in ("a", "b", "c"):
+        history.append({"role": "ai", "content": rec.generate_reply(history)})
+        history.append({"role": "user", "content": turn})
+    rec.generate_reply(history)
+
+    entries = list(iter_cassette(path))
+    if full_history:
+        assert [e["offset"] for e in entries] == [0, 0, 0, 0]
+        assert len(entries[-1]["messages"]) == 7
+    else:
+        assert [e["offset"] for e in entries] == [0, 2, 4, 6]
+        assert entries[-1]["messages"] == [{"role": "user", "content": "c"}]
+    # Replay still matches on the full request
+    assert AI_Replay(path).generate_reply(history) == "echo: c"
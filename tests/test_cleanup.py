@@ -0,0 +1,225 @@
+import sys
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+from scripts import cleanup
+
+
+def _make_tree(root):
+    (root / "pkg" / "__pycache__").mkdir(parents=True)
+    (root / "pkg" / "__pycache__" / "mod.cpython-311.pyc").write_bytes(b"x" * 10)
+    (root / "pkg" / "mod.py").write_text("print('hi')\n", encoding="utf-8")
+    (root / "pkg" / "old.bak").write_bytes(b"y" * 7)
+
+
+def test_scan_records_file_sizes(tmp_path):
+    _make_tree(tmp_path)
+    sizes = {}
+    files, dirs = cleanup.find_cleanup_targets(str(tmp_path), sizes=sizes)
+    bak = str(tmp_path / "pkg" / "old.bak")
+    assert bak in files
+    assert sizes[bak] == 7
+    assert str(tmp_path / "pkg" / "__pycache__") in dirs
+
+
+def test_parallel_size_and_delete(tmp_path):
+    _make_tree(tmp_path)
+    sizes = {}
+    files, dirs = cleanup.find_cleanup_targets(str(tmp_path), sizes=sizes)
+    total = cleanup.calculate_total_size(sorted(dirs), sizes=sizes, workers=4)
+    assert total == 10
+
+    deleted_dirs = cleanup.delete_paths(dirs, is_dir=True, workers=4, sizes=sizes)
+    assert deleted_dirs == [str(tmp_path / "pkg" / "__pycache__")]
+    assert (tmp_path / "pkg" / "mod.py").exists()
+
+
+def test_delete_paths_skips_nested_dirs(tmp_path):
+    outer = tmp_path / "build"
+    inner = outer / "__pycache__"
+    inner.mkdir(parents=True)
+    deleted = cleanup.delete_paths({str(outer), str(inner)}, is_dir=True, workers=2)
+    assert deleted == [str(outer)]
+    assert not outer.exists()
+
+
+def _gi(*lines):
+    return cleanup.GitIgnore.parse(lines)
+
+
+def test_gitignore_negation_and_dir_only():
+    gi = _gi("*.log", "!keep.log", "out/")
+    assert gi.match("a/b.log", False) is True
+    assert gi.match("a/keep.log", False) is False
+    assert gi.match("out", True) is True
+    assert gi.match("out", False) is None
+
+
+def test_gitignore_anchoring_and_double_star():
+    gi = _gi("/top.txt", "docs/*.pdf", "**/cache", "logs/**", "a/**/z")
+    assert gi.match("top.txt", False) is True
+    assert gi.match("sub/top.txt", False) is None
+    assert gi.match("docs/x.pdf", False) is True
+    assert gi.match("docs/deep/x.pdf", False) is None
+    assert gi.match("x/y/cache", True) is True
+    assert gi.match("logs/a/b", False) is True
+    assert gi.match("logs", True) is None
+    assert gi.match("a/z", False) is True
+    assert gi.match("a/b/c/z", False) is True
+
+
+def test_gitignore_keeps_leading_dot():
+    gi = _gi(".env", "\\#literal", "trail\\ ")
+    assert gi.match(".env", False) is True
+    assert gi.match("env", False) is None
+    assert gi.match("#literal", False) is True
+    assert gi.match("trail ", False) is True
+
+
+def test_scan_with_nested_gitignore_prunes_subtrees(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.dat\n/generated/\n", encoding="utf-8")
+    (tmp_path / "generated" / "deep").mkdir(parents=True)
+    (tmp_path / "generated" / "deep" / "x.pyc").write_bytes(b"")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("!keep.dat\n", encoding="utf-8")
+    (tmp_path / "sub" / "keep.dat").write_bytes(b"")
+    (tmp_path / "sub" / "drop.dat").write_bytes(b"")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "obj.dat").write_bytes(b"")
+
+    files, dirs = cleanup.find_cleanup_targets(str(tmp_path), include_gitignore=True)
+    assert dirs == {str(tmp_path / "generated")}
+    assert files == {str(tmp_path / "sub" / "drop.dat")}
+
+
+def test_incremental_index_skips_unchanged_dirs(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / "other").mkdir()
+
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    first = cleanup.find_cleanup_targets(str(tmp_path), index=index)
+    index.save()
+    assert (tmp_path / cleanup.INDEX_NAME).exists()
+    assert index.reused == 0
+
+    # Creating the index file bumps the root's mtime once
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    cleanup.find_cleanup_targets(str(tmp_path), index=index)
+    index.save()
+    assert index.reused == 2
+
+    sizes = {}
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    second = cleanup.find_cleanup_targets(str(tmp_path), sizes=sizes, index=index)
+    assert second == first
+    assert index.reused == index.visited == 3
+    assert sizes[str(tmp_path / "pkg" / "old.bak")] == 7
+
+    (tmp_path / "other" / "new.tmp").write_bytes(b"")
+    files, _ = cleanup.find_cleanup_targets(str(tmp_path), index=index)
+    assert str(tmp_path / "other" / "new.tmp") in files
+    assert index.reused == 2
+
+
+def test_index_discarded_when_rules_change(tmp_path):
+    _make_tree(tmp_path)
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    cleanup.find_cleanup_targets(str(tmp_path), index=index)
+    index.save()
+    assert cleanup.ScanIndex.load(str(tmp_path), include_gitignore=True).records == {}
+
+
+def test_validate_index_matches_full_scan(tmp_path):
+    _make_tree(tmp_path)
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    files, dirs = cleanup.find_cleanup_targets(str(tmp_path), index=index)
+    index.save()
+
+    index = cleanup.ScanIndex.load(str(tmp_path))
+    sizes = {}
+    files2, dirs2 = cleanup.find_cleanup_targets(str(tmp_path), sizes=sizes, index=index)
+    assert cleanup.validate_index(str(tmp_path), index, files2, dirs2, sizes) == (files, dirs)
+
+
+def test_ndjson_stream_roundtrips_as_plan(tmp_path):
+    import io
+    import json
+
+    _make_tree(tmp_path)
+    out = io.StringIO()
+    targets = cleanup.iter_sized_targets(cleanup.iter_cleanup_targets(str(tmp_path)), workers=2)
+    assert cleanup.write_ndjson(targets, out) == 2
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    by_rule = {r["rule"]: r for r in records}
+    assert by_rule["*.bak"]["size"] == 7
+    assert by_rule["__pycache__/"]["type"] == "dir"
+    assert by_rule["__pycache__/"]["size"] == 10
+
+    summary = cleanup.summarize_targets(records)
+    assert summary[0] == {"rule": "__pycache__/", "count": 1, "bytes": 10}
+
+    files, dirs, sizes = cleanup.load_plan(out.getvalue().splitlines(), str(tmp_path))
+    assert files == {str(tmp_path / "pkg" / "old.bak")}
+    assert dirs == {str(tmp_path / "pkg" / "__pycache__")}
+    assert sizes[str(tmp_path / "pkg" / "old.bak")] == 7
+
+
+def test_load_plan_rejects_outside_and_protected_paths(tmp_path):
+    lines = [
+        '{"path": "/etc/passwd", "type": "file", "size": 1, "rule": "x"}',
+        '{"path": "%s", "type": "dir", "size": null, "rule": "x"}' % (tmp_path / ".git" / "objects"),
+        "not json",
+    ]
+    assert cleanup.load_plan(lines, str(tmp_path)) == (set(), set(), {})
+
+
+def test_index_invalidated_when_exclude_file_changes(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "foo.dat").write_bytes(b"")
+    exclude = tmp_path / ".git" / "info" / "exclude"
+    exclude.parent.mkdir(parents=True)
+    exclude.write_text("", encoding="utf-8")
+
+    index = cleanup.ScanIndex.load(str(tmp_path), include_gitignore=True)
+    assert cleanup.find_cleanup_targets(str(tmp_path), include_gitignore=True, index=index) == (set(), set())
+    index.save()
+
+    exclude.write_text("*.dat\n", encoding="utf-8")
+    index = cleanup.ScanIndex.load(str(tmp_path), include_gitignore=True)
+    files, _ = cleanup.find_cleanup_targets(str(tmp_path), include_gitignore=True, index=index)
+    assert files == {str(tmp_path / "sub" / "foo.dat")}
+    index.save()
+
+    exclude.write_text("# nothing\n", encoding="utf-8")
+    index = cleanup.ScanIndex.load(str(tmp_path), include_gitignore=True)
+    assert cleanup.find_cleanup_targets(str(tmp_path), include_gitignore=True, index=index) == (set(), set())
+
+
+def test_load_plan_refuses_paths_through_symlinked_dirs(tmp_path):
+    root = tmp_path / "root"
+    outside = tmp_path / "outside"
+    root.mkdir()
+    outside.mkdir()
+    (outside / "victim.txt").write_bytes(b"")
+    (root / "esc").symlink_to(outside, target_is_directory=True)
+
+    line = '{"path": "%s", "type": "file", "size": 0, "rule": "x"}' % (root / "esc" / "victim.txt")
+    assert cleanup.load_plan([line], str(root)) == (set(), set(), {})
+
+
+def test_ndjson_plan_roundtrip_through_symlinked_root(tmp_path):
+    import io
+
+    real = tmp_path / "real"
+    real.mkdir()
+    _make_tree(real)
+    link = tmp_path / "link"
+    link.symlink_to(real, target_is_directory=True)
+
+    out = io.StringIO()
+    cleanup.write_ndjson(cleanup.iter_cleanup_targets(str(link)), out)
+    files, dirs, _ = cleanup.load_plan(out.getvalue().splitlines(), str(link))
+    assert files == {str(real / "pkg" / "old.bak")}
+    assert dirs == {str(real / "pkg" / "__pycache__")}
@@ -31,3 +31,20 @@ def test_get_ai_backend_default_and_override(tmp_path, monkeypatch):
 
     monkeypatch.setenv("AI_BACKEND", "GPT")
     assert get_ai_backend(base_dir=proj) == "gpt"
+
+
+def test_get_ai_executor_config_defaults_and_override(tmp_path, monkeypatch):
+    from config import get_ai_executor_config
+
+    proj = tmp_path / "proj"
+    (proj / "config").mkdir(parents=True)
+    (proj / "config" / ".env").write_text("", encoding="utf-8")
+    for name in ("AI_MAX_WORKERS", "AI_MAX_QUEUE", "AI_POLL_INTERVAL"):
+        monkeypatch.delenv(name, raising=False)
+
+    assert get_ai_executor_config(base_dir=proj) == {"max_workers": 4, "max_queue": 16, "poll_interval": 0.5}
+
+    monkeypatch.setenv("AI_MAX_WORKERS", "2")
+    monkeypatch.setenv("AI_MAX_QUEUE", "bad")
+    assert get_ai_executor_config(base_dir=proj)["max_workers"] == 2
+    assert get_ai_executor_config(base_dir=proj)["max_queue"] == 16
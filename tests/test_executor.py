@@ -0,0 +1,40 @@
+import sys
+import threading
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+import pytest
+
+from ai.executor import AIExecutor, ExecutorSaturated
+
+
+def test_executor_runs_and_reports_metrics():
+    ex = AIExecutor(max_workers=1, max_queue=1)
+    gate = threading.Event()
+    first = ex.submit(gate.wait, 5)
+    second = ex.submit(lambda: "queued done")
+
+    with pytest.raises(ExecutorSaturated):
+        ex.submit(lambda: "rejected")
+    m = ex.metrics()
+    assert m["workers"] == 1
+    assert m["rejected"] == 1
+    assert m["saturation"] == 1.0
+
+    gate.set()
+    assert first.result(timeout=5) is True
+    assert second.result(timeout=5) == "queued done"
+    assert ex.metrics()["queued"] == 0
+    assert ex.metrics()["running"] == 0
+
+
+def test_cancelled_queued_call_frees_capacity():
+    ex = AIExecutor(max_workers=1, max_queue=1)
+    gate = threading.Event()
+    running = ex.submit(gate.wait, 5)
+    queued = ex.submit(lambda: "never")
+    assert queued.cancel()
+    assert ex.submit(lambda: "ok") is not None
+    gate.set()
+    running.result(timeout=5)
@@ -20,3 +20,26 @@ def test_get_ai_raises_on_unknown_backend(monkeypatch):
     monkeypatch.setenv("AI_BACKEND", "unknown")
     with pytest.raises(ValueError):
         _ = get_ai()
+
+
+def test_get_ai_replay_backend(tmp_path, monkeypatch):
+    from ai.cassette import AI_Replay
+
+    cassette = tmp_path / "c.ndjson"
+    cassette.write_text("", encoding="utf-8")
+    monkeypatch.setenv("AI_BACKEND", "replay")
+    monkeypatch.setenv("AI_CASSETTE", str(cassette))
+    assert isinstance(get_ai(), AI_Replay)
+
+
+def test_get_ai_gateway_backend_is_shared_thin_client(monkeypatch):
+    from ai import gateway
+
+    monkeypatch.setattr(gateway, "_CLIENT", None)
+    monkeypatch.setenv("AI_BACKEND", "gateway")
+    monkeypatch.setenv("AI_GATEWAY_ADDR", "127.0.0.1:9")
+    monkeypatch.setenv("AI_GATEWAY_TOKEN", "secret")
+    ai = get_ai()
+    assert isinstance(ai, gateway.AI_Gateway)
+    assert (ai.address, ai.token) == ("127.0.0.1:9", "secret")
+    assert get_ai() is ai  # one connection pool per process
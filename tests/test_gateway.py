@@ -0,0 +1,174 @@
+import struct
+import socket
+import sys
+import threading
+import time
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+import pytest
+
+from ai.base import AI
+from ai.gateway import AI_Gateway, GatewayError, serve
+
+TOKEN = "test-token"
+
+
+class _EchoAI(AI):
+    def __init__(self):
+        super().__init__()
+        self.contexts = []
+
+    def generate_reply(self, messages, context=None):
+        self.contexts.append(context)
+        if messages[-1]["content"] == "boom":
+            raise LookupError("nothing recorded")
+        return f"{len(messages)}: {messages[-1]['content']}"
+
+
+def _start(address, backend):
+    server = serve(address, backend, TOKEN)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_gateway_round_trip_over_tcp():
+    backend = _EchoAI()
+    server = _start("127.0.0.1:0", backend)
+    try:
+        host, port = server.server_address[:2]
+        client = AI_Gateway(f"{host}:{port}", TOKEN, timeout=5)
+        assert client.ping()
+        msgs = [{"role": "user", "content": "hi", "ts": "x"}, {"role": "ai", "content": "yo"},
+                {"role": "user", "content": "big\n" * 10000}]
+        assert client.generate_reply(msgs, context={"session_id": "s1"}) == "3: " + "big\n" * 10000
+        assert backend.contexts == [{"session_id": "s1"}]
+        with pytest.raises(GatewayError, match="LookupError: nothing recorded"):
+            client.generate_reply([{"role": "user", "content": "boom"}])
+        assert len(client._idle) == 1  # one connection reused throughout
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_client_reconnects_after_restart():
+    backend = _EchoAI()
+    server = _start("127.0.0.1:0", backend)
+    host, port = server.server_address[:2]
+    client = AI_Gateway(f"{host}:{port}", TOKEN, timeout=5)
+    assert client.ping()
+    server.shutdown()
+    server.server_close()
+    # Drop the pooled connection server-side, then bring the gateway back on the same port
+    for sock, _ in client._idle:
+        sock.shutdown(socket.SHUT_RDWR)
+    server = _start(f"{host}:{port}", backend)
+    try:
+        assert client.generate_reply([{"role": "user", "content": "again"}]) == "1: again"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_gateway_over_unix_socket(tmp_path):
+    path = tmp_path / "ai.sock"
+    server = _start(f"unix:{path}", _EchoAI())
+    try:
+        assert AI_Gateway(f"unix:{path}", TOKEN, timeout=5).generate_reply([{"role": "user", "content": "u"}]) == "1: u"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_rejects_non_loopback_address():
+    with pytest.raises(ValueError):
+        serve("8.8.8.8:0", _EchoAI(), TOKEN)
+
+
+def test_gateway_closes_idle_connections_and_client_reconnects():
+    server = serve("127.0.0.1:0", _EchoAI(), TOKEN, idle_timeout=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        host, port = server.server_address[:2]
+        client = AI_Gateway(f"{host}:{port}", TOKEN, timeout=5)
+        assert client.ping()
+        (pooled, _), = client._idle
+        time.sleep(0.5)
+        assert pooled.recv(1) == b""  # server hung up on the idle connection
+        assert client.generate_reply([{"role": "user", "content": "later"}]) == "1: later"
+        assert client._idle[0][0] is not pooled
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_client_does_not_replay_request_after_reset():
+    listener = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def fake_gateway():
+        conn, _ = listener.accept()
+        rfile = conn.makefile("rb")
+        received.append(rfile.readline())
+        conn.sendall(b'{"id":1,"ok":true}\n')
+        received.append(rfile.readline())
+        # Abort mid-request with a reset instead of replying
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        rfile.close()
+        conn.close()
+
+    t = threading.Thread(target=fake_gateway, daemon=True)
+    t.start()
+    try:
+        client = AI_Gateway("127.0.0.1:%d" % listener.getsockname()[1], TOKEN, timeout=5)
+        assert client.ping()
+        with pytest.raises(ConnectionResetError):
+            client.generate_reply([{"role": "user", "content": "once"}])
+        t.join(5)
+        assert len(received) == 2  # the request was sent exactly once
+        assert not client._idle
+    finally:
+        listener.close()
+
+
+def test_gateway_drops_http_requests_without_calling_backend():
+    backend = _EchoAI()
+    server = _start("127.0.0.1:0", backend)
+    try:
+        host, port = server.server_address[:2]
+        # A cross-origin text/plain POST from a browser: even a valid request in the body is never read
+        body = '\n{"token":"%s","messages":[{"role":"user","content":"attacker prompt"}]}\n' % TOKEN
+        http = (
+            f"POST / HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n{body}"
+        )
+        with socket.create_connection((host, port), timeout=5) as sock:
+            sock.sendall(http.encode("utf-8"))
+            assert sock.recv(1024) == b""  # closed without a reply
+        assert backend.contexts == []
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_rejects_wrong_token():
+    backend = _EchoAI()
+    server = _start("127.0.0.1:0", backend)
+    try:
+        host, port = server.server_address[:2]
+        client = AI_Gateway(f"{host}:{port}", "wrong", timeout=5)
+        with pytest.raises(GatewayError, match="GatewayAuthError"):
+            client.generate_reply([{"role": "user", "content": "hi"}])
+        assert backend.contexts == []
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gateway_requires_a_token():
+    with pytest.raises(ValueError):
+        serve("127.0.0.1:0", _EchoAI(), "")
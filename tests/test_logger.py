@@ -25,3 +25,25 @@ def test_logger_writes_and_sanitizes(tmp_path, monkeypatch):
     data = log_file.read_text(encoding="utf-8")
     assert "hello world !".replace("  ", " ") in data
     assert "event:test a=b c" in data
+
+
+def test_logger_truncates_large_content_with_hash_and_spill(tmp_path, monkeypatch):
+    import hashlib
+
+    monkeypatch.setenv("LOG_ENABLED", "true")
+    log_file = tmp_path / "log.txt"
+    spill_dir = tmp_path / "spill"
+    monkeypatch.setenv("LOG_FILE", str(log_file))
+    monkeypatch.setenv("LOG_MAX_CHARS", "16")
+    monkeypatch.setenv("LOG_SPILL_DIR", str(spill_dir))
+    ChatLogger._CFG = Config.load(base_dir=Path(__file__).parent.parent)
+
+    content = "line one\n\tline two " + "x" * 1000
+    ChatLogger().log("user", content)
+
+    data = log_file.read_text(encoding="utf-8")
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    assert "user: line one line t ...[truncated chars=1019" in data
+    assert f"sha256={digest}" in data
+    assert (spill_dir / f"{digest}.txt").read_text(encoding="utf-8") == content
+    assert len(data) < 300
@@ -0,0 +1,98 @@
+import sys
+import time
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ai.base import AI
+from ai.semantic_cache import AI_SemanticCache, SemanticCache
+
+
+class _CountingAI(AI):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def generate_reply(self, messages, context=None):
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+def _ask(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_near_duplicate_prompt_hits_cache():
+    inner = _CountingAI()
+    cache = SemanticCache(capacity=8, dim=1024, threshold=0.8)
+    ai = AI_SemanticCache(inner, cache)
+
+    assert ai.generate_reply(_ask("What is the capital of Egypt?")) == "reply 1"
+    assert ai.generate_reply(_ask("what's the capital of egypt")) == "reply 1"
+    assert ai.generate_reply(_ask("How do I sort a list in Python?")) == "reply 2"
+    assert inner.calls == 2
+
+    m = cache.metrics()
+    assert (m["hits"], m["misses"], m["size"]) == (1, 2, 2)
+    assert m["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+def test_lru_eviction_keeps_recently_used_entry():
+    cache = SemanticCache(capacity=2, dim=512, threshold=0.99)
+    a, b, c = (cache.embed(_ask(t)) for t in ("alpha question", "beta question", "gamma question"))
+    cache.insert(a, "A")
+    cache.insert(b, "B")
+    assert cache.lookup(a)[0] == "A"  # a is now most recently used
+    cache.insert(c, "C")  # evicts b
+    assert cache.lookup(b)[0] is None
+    assert cache.lookup(a)[0] == "A"
+    assert cache.lookup(c)[0] == "C"
+
+
+def test_embed_without_user_turn_bypasses_cache():
+    inner = _CountingAI()
+    ai = AI_SemanticCache(inner, SemanticCache(capacity=2, dim=256))
+    ai.generate_reply([{"role": "system", "content": "hi"}])
+    ai.generate_reply([{"role": "system", "content": "hi"}])
+    assert inner.calls == 2
+
+
+def test_huge_message_embeds_in_bounded_time():
+    cache = SemanticCache(capacity=2, dim=1024, threshold=0.9)
+    base = "lorem ipsum dolor sit amet " * 120_000  # ~3 MB paste
+    t0 = time.perf_counter()
+    a = cache.embed(_ask(base + "first ending"))
+    assert time.perf_counter() - t0 < 0.5
+    cache.insert(a, "A")
+    assert cache.lookup(cache.embed(_ask(base + "first ending")))[0] == "A"
+    # Same featurized prefix, different tail: must not be served the cached reply
+    assert cache.lookup(cache.embed(_ask(base + "second ending")))[0] is None
+
+
+def test_one_word_change_in_longer_prompt_misses_at_default_threshold():
+    inner = _CountingAI()
+    ai = AI_SemanticCache(inner, SemanticCache(capacity=8, dim=2048))
+    ask = "How do I fix an error about inconsistent use of tabs and spaces in indentation in {}? Give a short answer."
+    assert ai.generate_reply(_ask(ask.format("Python"))) == "reply 1"
+    assert ai.generate_reply(_ask(ask.format("Python"))) == "reply 1"
+    assert ai.generate_reply(_ask(ask.format("Java"))) == "reply 2"
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Convert 100 USD to EUR using today's rate, and show the arithmetic step by step please",
+     "Convert 1000 USD to EUR using today's rate, and show the arithmetic step by step please"),
+    ("Is it safe to drink tap water in Paris if I am travelling there with two small children?",
+     "Is it not safe to drink tap water in Paris if I am travelling there with two small children?"),
+])
+def test_numbers_and_negations_must_match_for_a_hit(a, b):
+    inner = _CountingAI()
+    cache = SemanticCache(capacity=8, dim=2048, threshold=0.8)  # Loose enough that the vectors alone would hit
+    ai = AI_SemanticCache(inner, cache)
+    assert float(cache.embed(_ask(a)) @ cache.embed(_ask(b))) >= 0.8
+    assert ai.generate_reply(_ask(a)) == "reply 1"
+    assert ai.generate_reply(_ask(b)) == "reply 2"
+    assert ai.generate_reply(_ask(a.lower())) == "reply 1"
@@ -0,0 +1,77 @@
+import sys
+import types
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+import pytest
+
+from ai.usage import TokenBudgetExceeded, UsageMeter
+
+
+def test_record_aggregates_by_model_and_session():
+    meter = UsageMeter(flush_secs=3600)
+    meter.record("m", "s1", types.SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+    meter.record("m", "s1", {"prompt_tokens": 1, "completion_tokens": 2})
+    meter.record("m", "s2", None)
+
+    (key, row), = meter.snapshot().items()
+    assert key[:2] == ("m", "s1")
+    assert row == [2, 11, 7]
+    assert meter.session_total("s1") == 18
+
+
+def test_flush_resets_counters_but_keeps_session_totals():
+    meter = UsageMeter(flush_secs=3600)
+    meter.record("m", "s", {"prompt_tokens": 3, "completion_tokens": 4})
+    meter.flush()
+    assert meter.snapshot() == {}
+    assert meter.session_total("s") == 7
+
+
+def test_budget_reject_mode():
+    meter = UsageMeter(flush_secs=3600, session_budget=10, budget_mode="reject")
+    msgs = [{"role": "user", "content": "hi"}]
+    assert meter.enforce_budget("s", msgs) == msgs
+    meter.record("m", "s", {"prompt_tokens": 8, "completion_tokens": 2})
+    with pytest.raises(TokenBudgetExceeded):
+        meter.enforce_budget("s", msgs)
+    assert meter.enforce_budget("other", msgs) == msgs
+
+
+def test_budget_trim_mode_keeps_system_and_last_message():
+    meter = UsageMeter(flush_secs=3600, session_budget=20, budget_mode="trim")
+    msgs = [
+        {"role": "system", "content": "be brief"},
+        {"role": "user", "content": "x" * 40},
+        {"role": "assistant", "content": "y" * 40},
+        {"role": "user", "content": "last"},
+    ]
+    assert meter.enforce_budget("s", msgs) == [msgs[0], msgs[3]]
+
+
+def test_budget_trim_mode_rejects_once_spent_or_too_large():
+    meter = UsageMeter(flush_secs=3600, session_budget=100, budget_mode="trim")
+    big = [{"role": "user", "content": "x" * 8000}]
+    with pytest.raises(TokenBudgetExceeded):
+        meter.enforce_budget("s", big)  # fits nowhere even after trimming
+
+    meter.record("m", "s", {"prompt_tokens": 10000, "completion_tokens": 0})
+    with pytest.raises(TokenBudgetExceeded):
+        meter.enforce_budget("s", [{"role": "user", "content": "hi"}])
+
+
+def test_background_flusher_empties_counters():
+    import time
+
+    meter = UsageMeter(flush_secs=3600)
+    meter.record("m", "s", {"prompt_tokens": 1, "completion_tokens": 1})
+    meter.flush_secs = 0.01
+    meter.start()
+    try:
+        deadline = time.monotonic() + 2
+        while meter.snapshot() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert meter.snapshot() == {}
+    finally:
+        meter.stop()
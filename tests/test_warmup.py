@@ -0,0 +1,64 @@
+import sys
+import types
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, abspath(join(dirname(__file__), "..")))
+
+from ai import warmup as warmup_mod
+from ai.warmup import ConnectionWarmer
+
+
+class _PingClient:
+    def __init__(self):
+        self.pings = 0
+        self.models = types.SimpleNamespace(retrieve=self._retrieve)
+
+    def _retrieve(self, model):
+        self.pings += 1
+
+
+def test_warmer_builds_client_and_pings(monkeypatch):
+    client = _PingClient()
+    monkeypatch.setattr(
+        warmup_mod, "get_openai_config", lambda: {"api_key": "x", "model": "gpt-test", "client": client}
+    )
+    warmer = ConnectionWarmer(keepalive_secs=0)
+    assert warmer.config(timeout=1) is None  # not started
+
+    warmer.start()
+    cfg = warmer.config(timeout=5)
+    assert cfg["client"] is client
+    assert client.pings == 1
+
+
+def test_ai_gpt_uses_warm_client(monkeypatch):
+    from ai import gpt as gpt_mod
+
+    client = _PingClient()
+    warmer = ConnectionWarmer(keepalive_secs=0)
+    monkeypatch.setattr(
+        warmup_mod, "get_openai_config", lambda: {"api_key": "x", "model": "gpt-test", "client": client}
+    )
+    warmer.start()
+    monkeypatch.setattr(gpt_mod, "get_warmer", lambda: warmer)
+
+    ai = gpt_mod.AI_GPT()
+    assert ai.warm is True
+    assert ai.client is client
+
+
+def test_config_does_not_wait_for_ping(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    client = _PingClient()
+    client.models = types.SimpleNamespace(retrieve=lambda model: release.wait(5))
+    monkeypatch.setattr(
+        warmup_mod, "get_openai_config", lambda: {"api_key": "x", "model": "gpt-test", "client": client}
+    )
+    warmer = ConnectionWarmer(keepalive_secs=0)
+    warmer.start()
+    try:
+        assert warmer.config(timeout=1)["client"] is client  # ping still blocked
+    finally:
+        release.set()